@@ -6,7 +6,7 @@ from alembic import context
 from app.database import Base
 from app.config import settings
 
-from app.models import user, establishment, court, coach, booking, coach_booking  # noqa
+from app.models import user, establishment, court, coach, booking, coach_booking, image_upload  # noqa
 
 config = context.config
 
@@ -0,0 +1,28 @@
+"""add_clerk_user_id_to_users
+
+Revision ID: 2a6e8f14c7b3
+Revises: e7c41b0d2f6a
+Create Date: 2026-10-17 12:41:52.104377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6e8f14c7b3'
+down_revision: Union[str, Sequence[str], None] = 'e7c41b0d2f6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('clerk_user_id', sa.String(), nullable=True))
+    op.create_index(op.f('ix_users_clerk_user_id'), 'users', ['clerk_user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_clerk_user_id'), table_name='users')
+    op.drop_column('users', 'clerk_user_id')
@@ -0,0 +1,32 @@
+"""add_establishment_location_index
+
+Revision ID: 4c8d2b7e5a19
+Revises: 7f3b9c2d8e10
+Create Date: 2026-10-17 23:40:12.417903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8d2b7e5a19'
+down_revision: Union[str, Sequence[str], None] = '7f3b9c2d8e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bounding-box prefilter for /establishments/nearby; only mapped, active venues are searchable
+    op.create_index(
+        'ix_establishments_lat_lng',
+        'establishments',
+        ['latitude', 'longitude'],
+        postgresql_where=sa.text('is_active AND latitude IS NOT NULL AND longitude IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_establishments_lat_lng', table_name='establishments')
@@ -0,0 +1,45 @@
+"""add_booking_overlap_constraints
+
+Revision ID: 5d0f7a3e91c4
+Revises: 9b22838a28b4
+Create Date: 2026-10-17 10:03:27.540116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0f7a3e91c4'
+down_revision: Union[str, Sequence[str], None] = '9b22838a28b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Reject overlapping confirmed bookings in the database. Existing overlaps must be cancelled first."""
+    # btree_gist lets the GiST index combine plain equality (uuid, date) with range overlap
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_court_overlap "
+        "EXCLUDE USING gist (court_id WITH =, date WITH =, int4range(start_minute, end_minute) WITH &&) "
+        "WHERE (status = 'confirmed')"
+    )
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_coach_overlap "
+        "EXCLUDE USING gist (coach_id WITH =, date WITH =, int4range(start_minute, end_minute) WITH &&) "
+        "WHERE (status = 'confirmed' AND include_coach)"
+    )
+    op.execute(
+        "ALTER TABLE coach_bookings ADD CONSTRAINT ex_coach_bookings_coach_overlap "
+        "EXCLUDE USING gist (coach_id WITH =, date WITH =, int4range(start_minute, end_minute) WITH &&) "
+        "WHERE (status = 'confirmed')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ex_coach_bookings_coach_overlap', 'coach_bookings')
+    op.drop_constraint('ex_bookings_coach_overlap', 'bookings')
+    op.drop_constraint('ex_bookings_court_overlap', 'bookings')
@@ -0,0 +1,33 @@
+"""add_image_uploads
+
+Revision ID: 7f3b9c2d8e10
+Revises: 2a6e8f14c7b3
+Create Date: 2026-10-17 14:05:38.772915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3b9c2d8e10'
+down_revision: Union[str, Sequence[str], None] = '2a6e8f14c7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('image_uploads',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('folder', sa.String(), nullable=False),
+    sa.Column('secure_url', sa.String(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('sha256', 'folder')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('image_uploads')
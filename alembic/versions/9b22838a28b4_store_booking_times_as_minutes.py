@@ -0,0 +1,53 @@
+"""store_booking_times_as_minutes
+
+Revision ID: 9b22838a28b4
+Revises: 8161d58c2f96
+Create Date: 2026-10-17 09:12:44.318902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b22838a28b4'
+down_revision: Union[str, Sequence[str], None] = '8161d58c2f96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_TABLES = ['bookings', 'coach_bookings']
+
+
+def upgrade() -> None:
+    """Replace 'HH:MM' start_time/end_time strings with integer minutes since midnight."""
+    for table in _TABLES:
+        op.add_column(table, sa.Column('start_minute', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('end_minute', sa.Integer(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET "
+            "start_minute = split_part(start_time, ':', 1)::int * 60 + split_part(start_time, ':', 2)::int, "
+            "end_minute = split_part(end_time, ':', 1)::int * 60 + split_part(end_time, ':', 2)::int"
+        )
+        op.alter_column(table, 'start_minute', nullable=False)
+        op.alter_column(table, 'end_minute', nullable=False)
+        op.drop_column(table, 'start_time')
+        op.drop_column(table, 'end_time')
+
+
+def downgrade() -> None:
+    """Restore the 'HH:MM' string columns."""
+    for table in _TABLES:
+        op.add_column(table, sa.Column('start_time', sa.VARCHAR(), nullable=True))
+        op.add_column(table, sa.Column('end_time', sa.VARCHAR(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET "
+            "start_time = lpad((start_minute / 60)::text, 2, '0') || ':' || lpad((start_minute % 60)::text, 2, '0'), "
+            "end_time = lpad((end_minute / 60)::text, 2, '0') || ':' || lpad((end_minute % 60)::text, 2, '0')"
+        )
+        op.alter_column(table, 'start_time', nullable=False)
+        op.alter_column(table, 'end_time', nullable=False)
+        op.drop_column(table, 'start_minute')
+        op.drop_column(table, 'end_minute')
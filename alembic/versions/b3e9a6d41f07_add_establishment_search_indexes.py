@@ -0,0 +1,34 @@
+"""add_establishment_search_indexes
+
+Revision ID: b3e9a6d41f07
+Revises: 4c8d2b7e5a19
+Create Date: 2026-10-18 00:05:47.130552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9a6d41f07'
+down_revision: Union[str, Sequence[str], None] = '4c8d2b7e5a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Must match app.services.search.establishment_document() exactly
+    op.execute(
+        "CREATE INDEX ix_establishments_search_trgm ON establishments USING gin "
+        "((name || ' ' || location || ' ' || coalesce(description, '')) gin_trgm_ops)"
+    )
+    # Serves the existing `location ILIKE '%...%'` filter on the listing
+    op.execute("CREATE INDEX ix_establishments_location_trgm ON establishments USING gin (location gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_establishments_location_trgm', table_name='establishments')
+    op.drop_index('ix_establishments_search_trgm', table_name='establishments')
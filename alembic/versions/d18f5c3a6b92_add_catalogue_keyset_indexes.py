@@ -0,0 +1,35 @@
+"""add_catalogue_keyset_indexes
+
+Revision ID: d18f5c3a6b92
+Revises: b3e9a6d41f07
+Create Date: 2026-10-18 00:31:09.664021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd18f5c3a6b92'
+down_revision: Union[str, Sequence[str], None] = 'b3e9a6d41f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset order of the public listings: (created_at, id) over active rows
+    op.create_index(
+        'ix_establishments_active_created', 'establishments', ['created_at', 'id'],
+        postgresql_where=sa.text('is_active'),
+    )
+    op.create_index(
+        'ix_coaches_active_created', 'coaches', ['created_at', 'id'],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_coaches_active_created', table_name='coaches')
+    op.drop_index('ix_establishments_active_created', table_name='establishments')
@@ -0,0 +1,29 @@
+"""add_booking_user_indexes
+
+Revision ID: e7c41b0d2f6a
+Revises: 5d0f7a3e91c4
+Create Date: 2026-10-17 11:20:05.882310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c41b0d2f6a'
+down_revision: Union[str, Sequence[str], None] = '5d0f7a3e91c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset order of the per-user schedule timeline: (date, start_minute, id)
+    op.create_index('ix_bookings_user_date_start', 'bookings', ['user_id', 'date', 'start_minute', 'id'])
+    op.create_index('ix_coach_bookings_user_date_start', 'coach_bookings', ['user_id', 'date', 'start_minute', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_coach_bookings_user_date_start')
+    op.drop_index('ix_bookings_user_date_start')
@@ -0,0 +1,32 @@
+"""add_catalogue_updated_at
+
+Revision ID: f2a7c0e8d4b5
+Revises: d18f5c3a6b92
+Create Date: 2026-10-18 01:02:44.905317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c0e8d4b5'
+down_revision: Union[str, Sequence[str], None] = 'd18f5c3a6b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('establishments', 'courts', 'coaches')
+
+
+def upgrade() -> None:
+    """Row versions for ETags; existing rows start at their creation time."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE created_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
@@ -7,10 +7,30 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
     frontend_url: str = "http://localhost:3000"
+    log_json: bool = True
+    log_sample_rate: float = 1.0  # fraction of successful requests logged on log_sampled_routes
+    log_sampled_routes: list[str] = ["/availability"]
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 500
     cloudinary_cloud_name: str = ""
     cloudinary_api_key: str = ""
     cloudinary_api_secret: str = ""
     clerk_secret_key: str = ""
+    clerk_jwks_url: str = "https://fond-lion-33.clerk.accounts.dev/.well-known/jwks.json"
+    clerk_api_url: str = "https://api.clerk.com/v1"
+    clerk_jwks_ttl_seconds: float = 3600.0
+    availability_cache_size: int = 10_000
+    availability_cache_ttl_seconds: float = 30.0
+    principal_cache_size: int = 10_000
+    principal_cache_ttl_seconds: float = 60.0
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    catalogue_cache_control: str = "public, max-age=30, must-revalidate"
 
     class Config:
         env_file = ".env"
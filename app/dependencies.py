@@ -2,14 +2,63 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event
+from sqlalchemy.orm import Session, object_session
 from app.database import get_db
 from app.models.user import User
 from app.config import settings
 from app.schemas.user import TokenData
+from app.services.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Authenticated principals keyed by user id, so steady-state requests skip the users SELECT.
+# Only the columns handlers read are kept; each hit builds a fresh detached User from them.
+# Entries are evicted after any ORM update or delete of the user commits. Core update(User) /
+# delete(User) statements bypass the mapper events — call invalidate_principal() after those.
+principal_cache = TTLCache(
+    "principals",
+    maxsize=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+_PRINCIPAL_FIELDS = ("id", "email", "full_name", "is_active", "created_at")
+
+
+# Bumped each time a user's principal is invalidated. A miss captures it before the SELECT and only
+# caches the row if it is unchanged, so a read that raced a committing update is never stored.
+_principal_generations: dict[str, int] = {}
+
+
+def invalidate_principal(user_id) -> None:
+    key = str(user_id)
+    _principal_generations[key] = _principal_generations.get(key, 0) + 1
+    principal_cache.invalidate(key)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_principal_changed(mapper, connection, target: User) -> None:
+    # Flush runs before COMMIT: evicting now would let a concurrent request re-cache the old row.
+    # Remember the id and evict once the transaction is committed.
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_principals", set()).add(str(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_changed_principals(session: Session) -> None:
+    for user_id in session.info.pop("changed_principals", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_principals(session: Session) -> None:
+    session.info.pop("changed_principals", None)
+
+
+def _inactive() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is deactivated")
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -28,8 +77,19 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        if cached["is_active"] is False:
+            raise _inactive()
+        return User(**cached)
+
+    generation = _principal_generations.get(user_id, 0)
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+    if _principal_generations.get(user_id, 0) == generation:
+        principal_cache.set(user_id, {field: getattr(user, field) for field in _PRINCIPAL_FIELDS})
+    if user.is_active is False:
+        raise _inactive()
     return user
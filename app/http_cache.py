@@ -0,0 +1,39 @@
+"""
+Conditional GET for catalogue routes.
+
+ETags are derived from the (id, updated_at) versions of the rows behind a response, so a route can
+answer If-None-Match with 304 right after its query, before anything is serialized.
+"""
+import hashlib
+from fastapi import Request, Response
+from app.config import settings
+
+
+def etag_for(rows) -> str:
+    """Weak validator over the ids and update timestamps of rows, in response order."""
+    digest = hashlib.blake2b(digest_size=12)
+    for row in rows:
+        digest.update(f"{row.id}@{row.updated_at.isoformat()};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): the W/ prefix is ignored on both sides
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Attach validators to the outgoing response. If the client already holds this version,
+    return the 304 to send instead — the route should return it as-is.
+    """
+    headers = {"ETag": etag, "Cache-Control": settings.catalogue_cache_control}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
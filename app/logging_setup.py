@@ -0,0 +1,93 @@
+import copy
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from app.config import settings
+from app.request_context import request_id_var
+
+# Attributes every LogRecord has; anything else was passed through `extra=` and is emitted as a field
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request id. Runs on the caller's side, where the context is live."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s  %(levelname)-8s  [%(request_id)s]  %(message)s", datefmt="%H:%M:%S")
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener's formatter. The stock prepare() folds the
+    traceback into the message; here it is rendered into exc_text, where formatters expect it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Merge args now: they may be mutated or unsafe to read by the time the listener thread runs
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None  # tracebacks pin frames; only the rendered text crosses the queue
+        return record
+
+
+_listener: QueueListener | None = None
+_listening = False
+
+
+def setup_logging(logger: logging.Logger) -> None:
+    """
+    Route the logger through an in-memory queue. Callers on the event loop only enqueue the record;
+    a background thread formats it and writes it to stderr.
+    """
+    global _listener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    logger.addHandler(queue_handler)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter() if settings.log_json else TextFormatter())
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    start_logging()
+
+
+def start_logging() -> None:
+    global _listening
+    if _listener is not None and not _listening:
+        _listener.start()
+        _listening = True
+
+
+def stop_logging() -> None:
+    """Drain queued records and stop the writer thread."""
+    global _listening
+    if _listener is not None and _listening:
+        _listener.stop()
+        _listening = False
@@ -1,24 +1,39 @@
 import time
+import uuid
+import random
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routers import auth, establishments, courts, coaches, bookings, coach_bookings, availability
+from app.database import pool_stats
+from app.routers import auth, establishments, courts, coaches, bookings, coach_bookings, availability, schedule
 from app.routers import upload
+from app.services.cache import cache_stats
+from app.services.http_client import close_http_client
+from app.services.passwords import password_hasher
+from app.logging_setup import setup_logging, start_logging, stop_logging
+from app.request_context import request_id_var, route_template
+from app import metrics
 
 # ── Logging setup ─────────────────────────────────────────────────────────────
 logger = logging.getLogger("dinkr")
 if not logger.handlers:
-    _handler = logging.StreamHandler()
-    _handler.setFormatter(logging.Formatter(
-        "%(asctime)s  %(levelname)-8s  %(message)s",
-        datefmt="%H:%M:%S",
-    ))
-    logger.addHandler(_handler)
+    setup_logging(logger)
 logger.setLevel(logging.INFO)
 logger.propagate = False
 
-app = FastAPI(title="Dinkr API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_logging()
+    yield
+    await close_http_client()
+    stop_logging()
+
+
+app = FastAPI(title="Dinkr API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,24 +41,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+def _should_log(route: str, status: int) -> bool:
+    """Errors are always logged; successes on high-volume routes are sampled."""
+    if status >= 400 or settings.log_sample_rate >= 1.0:
+        return True
+    if not route.startswith(tuple(settings.log_sampled_routes)):
+        return True
+    return random.random() < settings.log_sample_rate
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    query_stats = metrics.QueryStats()
+    stats_token = metrics.query_stats_var.set(query_stats)
+    metrics.requests_in_flight.value += 1
     start = time.perf_counter()
-    response = await call_next(request)
-    ms = (time.perf_counter() - start) * 1000
-    status = response.status_code
-    level = logging.WARNING if status >= 400 else logging.INFO
-    logger.log(
-        level,
-        "%s %s  →  %d  (%.1f ms)",
-        request.method,
-        request.url.path,
-        status,
-        ms,
-    )
-    return response
+    try:
+        response = await call_next(request)
+    except Exception:
+        # Unhandled errors become a 500 further out; record them here or they vanish from metrics
+        ms = (time.perf_counter() - start) * 1000
+        route = route_template(request)
+        metrics.observe_request(request.method, route, 500, ms / 1000, query_stats)
+        logger.error(
+            "%s %s  →  unhandled exception  (%.1f ms)",
+            request.method,
+            request.url.path,
+            ms,
+            exc_info=True,
+            extra={"method": request.method, "route": route, "status": 500, "latency_ms": round(ms, 1)},
+        )
+        raise
+    else:
+        ms = (time.perf_counter() - start) * 1000
+        status = response.status_code
+        route = route_template(request)
+        response.headers["X-Request-ID"] = request_id
+        metrics.observe_request(request.method, route, status, ms / 1000, query_stats)
+        if _should_log(route, status):
+            level = logging.WARNING if status >= 400 else logging.INFO
+            logger.log(
+                level,
+                "%s %s  →  %d  (%.1f ms)",
+                request.method,
+                request.url.path,
+                status,
+                ms,
+                extra={"method": request.method, "route": route, "status": status, "latency_ms": round(ms, 1)},
+            )
+        return response
+    finally:
+        metrics.requests_in_flight.value -= 1
+        metrics.query_stats_var.reset(stats_token)
+        request_id_var.reset(token)
 
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(establishments.router, prefix="/establishments", tags=["Establishments"])
@@ -52,9 +107,21 @@ app.include_router(coaches.router, prefix="/coaches", tags=["Coaches"])
 app.include_router(bookings.router, prefix="/bookings", tags=["Bookings"])
 app.include_router(coach_bookings.router, prefix="/coach-bookings", tags=["Coach Bookings"])
 app.include_router(availability.router, prefix="/availability", tags=["Availability"])
+app.include_router(schedule.router, prefix="/schedule", tags=["Schedule"])
 app.include_router(upload.router, prefix="/upload", tags=["Upload"])
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "db_pool": pool_stats(),
+        "caches": cache_stats(),
+        "password_hashing": password_hasher.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus text exposition of request, SQL, pool and cache metrics for this worker."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,163 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Request metrics are keyed by route template, never the raw path, so label cardinality stays bounded.
+SQL statement counts and time are captured from SQLAlchemy cursor events and attributed to the
+request whose context issued them.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from app.database import engine, pool_stats
+from app.services.cache import cache_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in self._values.items()]
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.value = 0.0
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {self.value}"]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name, self.help, self.labelnames, self.buckets = name, help, labelnames, buckets
+        # labels → [per-bucket counts (non-cumulative, last one is +Inf), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                le = _labels((*self.labelnames, "le"), (*labels, bound))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            base = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {total}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+requests_total = Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+request_latency = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"), LATENCY_BUCKETS
+)
+requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+request_queries = Histogram(
+    "http_request_db_queries", "SQL statements issued per request.", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Total SQL execution time per request.", ("method", "route"), LATENCY_BUCKETS
+)
+db_queries_total = Counter("db_queries_total", "SQL statements executed.")
+
+_METRICS = (requests_total, request_latency, requests_in_flight, request_queries, request_db_time, db_queries_total)
+
+
+# ── SQL capture ───────────────────────────────────────────────────────────────
+class QueryStats:
+    """Mutable per-request tally; shared by reference with the endpoint's task context."""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+query_stats_var: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _record_statement(context) -> None:
+    # The start time lives on the per-statement execution context, so nothing outlives the statement
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    context._metrics_started = None
+    elapsed = time.perf_counter() - started
+    db_queries_total.inc()
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(context)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute does not fire for failed statements (e.g. exclusion-constraint 409s)
+    _record_statement(exception_context.execution_context)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, stats: QueryStats) -> None:
+    requests_total.inc(method, route, status)
+    request_latency.observe(seconds, method, route)
+    request_queries.observe(stats.queries, method, route)
+    request_db_time.observe(stats.seconds, method, route)
+
+
+def _snapshot_gauges() -> list[str]:
+    """Point-in-time values read at scrape: pool occupancy and cache counters."""
+    lines = []
+    pool = pool_stats()
+    for key in ("checked_out", "idle", "overflow", "timeouts"):
+        lines += [f"# TYPE db_pool_{key} gauge", f"db_pool_{key} {pool[key]}"]
+    lines += ["# TYPE db_pool_max_wait_ms gauge", f"db_pool_max_wait_ms {pool['max_wait_ms']}"]
+    lines.append("# TYPE cache_hits_total counter")
+    lines += [f'cache_hits_total{{cache="{name}"}} {s["hits"]}' for name, s in cache_stats().items()]
+    lines.append("# TYPE cache_misses_total counter")
+    lines += [f'cache_misses_total{{cache="{name}"}} {s["misses"]}' for name, s in cache_stats().items()]
+    return lines
+
+
+def render() -> str:
+    lines = []
+    for metric in _METRICS:
+        lines += metric.render()
+    lines += _snapshot_gauges()
+    return "\n".join(lines) + "\n"
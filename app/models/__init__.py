@@ -4,3 +4,4 @@ from app.models.court import Court
 from app.models.coach import Coach
 from app.models.booking import Booking
 from app.models.coach_booking import CoachBooking
+from app.models.image_upload import ImageUpload
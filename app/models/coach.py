@@ -22,3 +22,4 @@ class Coach(Base):
     schedule = Column(JSONB, nullable=False, default=DEFAULT_SCHEDULE)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
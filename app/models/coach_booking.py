@@ -1,7 +1,9 @@
-from sqlalchemy import Column, String, Float, DateTime, Date, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, Integer, DateTime, Date, ForeignKey
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.sql import func
 from app.database import Base
+from app.timeutil import to_hhmm
 import uuid
 
 
@@ -12,8 +14,24 @@ class CoachBooking(Base):
     coach_id = Column(UUID(as_uuid=True), ForeignKey("coaches.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     date = Column(Date, nullable=False)
-    start_time = Column(String, nullable=False)
-    end_time = Column(String, nullable=False)
+    start_minute = Column(Integer, nullable=False)  # minutes since midnight
+    end_minute = Column(Integer, nullable=False)
     total_price = Column(Float, nullable=False)
     status = Column(String, default="confirmed")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Overlapping confirmed bookings are rejected by the database (migration 5d0f7a3e91c4; needs btree_gist)
+    __table_args__ = (
+        ExcludeConstraint(
+            ("coach_id", "="), ("date", "="), (func.int4range(start_minute, end_minute), "&&"),
+            name="ex_coach_bookings_coach_overlap", using="gist", where=text("status = 'confirmed'"),
+        ),
+    )
+
+    @property
+    def start_time(self) -> str:
+        return to_hhmm(self.start_minute)
+
+    @property
+    def end_time(self) -> str:
+        return to_hhmm(self.end_minute)
@@ -25,5 +25,7 @@ class Establishment(Base):
     longitude = Column(Float, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    courts = relationship("Court", back_populates="establishment", lazy="selectin")
+    # Never loaded implicitly — routes that serialize courts ask for them with selectinload()
+    courts = relationship("Court", back_populates="establishment", lazy="raise")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ImageUpload(Base):
+    """Content-addressed index of images already pushed to storage, for upload dedup."""
+    __tablename__ = "image_uploads"
+    sha256 = Column(String(64), primary_key=True)
+    folder = Column(String, primary_key=True)
+    secure_url = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
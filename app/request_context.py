@@ -0,0 +1,11 @@
+from contextvars import ContextVar
+from starlette.requests import Request
+
+# Set by the HTTP middleware for the lifetime of each request; read by logging and metrics
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def route_template(request: Request) -> str:
+    """The matched route's path template (e.g. /courts/{court_id}), never the raw path with ids."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
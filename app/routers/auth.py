@@ -2,29 +2,44 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from passlib.context import CryptContext
 from jose import jwt, JWTError
 from jose.exceptions import ExpiredSignatureError
 from datetime import datetime, timedelta
 from pydantic import BaseModel
-import httpx
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserOut, Token
 from app.config import settings
 from app.dependencies import get_current_user
+from app.services.http_client import get_http_client
+from app.services.jwks import JWKSCache
+from app.services.passwords import password_hasher, HasherBusy
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 logger = logging.getLogger("dinkr")
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+def _busy() -> HTTPException:
+    logger.warning("Password hashing saturated — rejecting request")
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-in requests in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusy:
+        raise _busy()
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+async def verify_password(plain: str, hashed: str) -> bool:
+    try:
+        return await password_hasher.verify(plain, hashed)
+    except HasherBusy:
+        raise _busy()
 
 
 def create_access_token(user_id: str) -> str:
@@ -44,7 +59,7 @@ async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Email already registered")
     user = User(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password(payload.password),
         full_name=payload.full_name
     )
     db.add(user)
@@ -58,7 +73,7 @@ async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not await verify_password(payload.password, user.hashed_password):
         logger.warning("Login failed for: %s", payload.email)
         raise HTTPException(status_code=401, detail="Invalid credentials")
     logger.info("Login: %s", user.email)
@@ -75,24 +90,21 @@ class ClerkTokenPayload(BaseModel):
     token: str
 
 
-CLERK_JWKS_URL = "https://fond-lion-33.clerk.accounts.dev/.well-known/jwks.json"
-CLERK_API_URL = "https://api.clerk.com/v1"
+clerk_jwks = JWKSCache(
+    settings.clerk_jwks_url,
+    client=get_http_client,
+    ttl_seconds=settings.clerk_jwks_ttl_seconds,
+)
 
 
 async def _verify_clerk_token(token: str) -> str:
     """Verify a Clerk session JWT and return the Clerk user ID (sub)."""
-    async with httpx.AsyncClient() as client:
-        jwks_res = await client.get(CLERK_JWKS_URL)
-        jwks_res.raise_for_status()
-        jwks = jwks_res.json()
-
     try:
         header = jwt.get_unverified_header(token)
     except JWTError as exc:
         raise HTTPException(status_code=401, detail="Invalid Clerk token") from exc
 
-    kid = header.get("kid")
-    key = next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+    key = await clerk_jwks.get_key(header.get("kid"))
     if not key:
         raise HTTPException(status_code=401, detail="Clerk signing key not found")
 
@@ -111,20 +123,28 @@ async def _verify_clerk_token(token: str) -> str:
 
 async def _get_clerk_user(clerk_user_id: str) -> dict:
     """Fetch user details from Clerk's management API."""
-    async with httpx.AsyncClient() as client:
-        res = await client.get(
-            f"{CLERK_API_URL}/users/{clerk_user_id}",
-            headers={"Authorization": f"Bearer {settings.clerk_secret_key}"},
-        )
-        if res.status_code != 200:
-            raise HTTPException(status_code=401, detail="Failed to fetch Clerk user")
-        return res.json()
+    res = await get_http_client().get(
+        f"{settings.clerk_api_url}/users/{clerk_user_id}",
+        headers={"Authorization": f"Bearer {settings.clerk_secret_key}"},
+    )
+    if res.status_code != 200:
+        raise HTTPException(status_code=401, detail="Failed to fetch Clerk user")
+    return res.json()
 
 
 @router.post("/clerk", response_model=Token)
 async def clerk_oauth(payload: ClerkTokenPayload, db: AsyncSession = Depends(get_db)):
     """Exchange a Clerk session JWT for a Dinkr backend JWT."""
     clerk_user_id = await _verify_clerk_token(payload.token)
+
+    # Returning users are resolved straight from the verified subject — no Clerk API round trip
+    result = await db.execute(select(User).where(User.clerk_user_id == clerk_user_id))
+    user = result.scalar_one_or_none()
+    if user:
+        logger.info("OAuth login for linked user: %s (id=%s)", user.email, user.id)
+        return Token(access_token=create_access_token(user.id))
+
+    # First sign-in with this Clerk account: fetch the profile once and link it
     clerk_user = await _get_clerk_user(clerk_user_id)
 
     # Extract email and name from Clerk user object
@@ -141,12 +161,14 @@ async def clerk_oauth(payload: ClerkTokenPayload, db: AsyncSession = Depends(get
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
     if not user:
-        user = User(email=email, hashed_password=None, full_name=full_name)
+        user = User(email=email, hashed_password=None, full_name=full_name, clerk_user_id=clerk_user_id)
         db.add(user)
         await db.commit()
         await db.refresh(user)
         logger.info("New OAuth user created via Clerk: %s (id=%s)", email, user.id)
     else:
-        logger.info("OAuth login for existing user: %s (id=%s)", email, user.id)
+        user.clerk_user_id = clerk_user_id
+        await db.commit()
+        logger.info("OAuth login for existing user, linked Clerk account: %s (id=%s)", email, user.id)
 
     return Token(access_token=create_access_token(user.id))
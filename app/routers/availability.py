@@ -1,13 +1,22 @@
+import json
 import logging
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import date
+from sqlalchemy.orm import selectinload
+from datetime import date, timedelta
 from app.database import get_db
 from app.models.court import Court
 from app.models.establishment import Establishment
 from app.models.coach import Coach
-from app.services.availability import get_court_available_slots, get_coach_available_slots
+from app.services.availability import (
+    get_court_available_slots,
+    get_coach_available_slots,
+    get_courts_available_slots,
+    get_court_available_slots_range,
+    get_coach_available_slots_range,
+)
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
@@ -15,6 +24,7 @@ logger = logging.getLogger("dinkr")
 _DEFAULT_OPEN  = "06:00"
 _DEFAULT_CLOSE = "22:00"
 _WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_MAX_RANGE_DAYS = 42  # six calendar weeks — enough for any month grid
 
 
 def generate_slots(open_time: str, close_time: str) -> list[str]:
@@ -28,12 +38,56 @@ def generate_slots(open_time: str, close_time: str) -> list[str]:
     return slots
 
 
+def requested_days(day: date | None, start_date: date | None, end_date: date | None) -> list[date]:
+    """Resolve either a single `date` or a `start_date`/`end_date` range into the list of days to report."""
+    if day is not None and start_date is None and end_date is None:
+        return [day]
+    if day is None and start_date is not None and end_date is not None:
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+        span = (end_date - start_date).days + 1
+        if span > _MAX_RANGE_DAYS:
+            raise HTTPException(status_code=400, detail=f"Date range is limited to {_MAX_RANGE_DAYS} days")
+        return [start_date + timedelta(days=i) for i in range(span)]
+    raise HTTPException(status_code=400, detail="Provide either date, or both start_date and end_date")
+
+
+def day_hours(schedule: dict | None, day: date) -> tuple[str, dict]:
+    """Return the weekday name and its entry from a per-weekday schedule (empty if unset)."""
+    day_name = _WEEKDAYS[day.weekday()]
+    return day_name, (schedule or {}).get(day_name, {})
+
+
+def open_day_slots(schedule: dict | None, days: list[date]) -> dict:
+    """Map each day the schedule is open to its hourly slot boundaries; closed days are left out."""
+    time_slots_by_date = {}
+    for day in days:
+        _, hours = day_hours(schedule, day)
+        if not hours.get("closed", False):
+            time_slots_by_date[day] = generate_slots(hours.get("open", _DEFAULT_OPEN), hours.get("close", _DEFAULT_CLOSE))
+    return time_slots_by_date
+
+
+def stream_days(id_key: str, resource_id: str, days: list[date], time_slots_by_date: dict, slots_by_date: dict):
+    """Stream one single-day availability object per line (NDJSON), in date order."""
+    async def lines():
+        for day in days:
+            closed = day not in time_slots_by_date
+            payload = {id_key: resource_id, "date": str(day), "slots": slots_by_date.get(day, []), "closed": closed}
+            yield json.dumps(payload) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/court/{court_id}")
 async def court_availability(
     court_id: str,
-    date: date = Query(...),
+    date: date | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
+    days = requested_days(date, start_date, end_date)
+
     court_row = await db.execute(select(Court).where(Court.id == court_id))
     court = court_row.scalar_one_or_none()
     if not court:
@@ -41,10 +95,17 @@ async def court_availability(
 
     est_row = await db.execute(select(Establishment).where(Establishment.id == court.establishment_id))
     est = est_row.scalar_one_or_none()
+    schedule = est.schedule if est else None
+
+    if date is None:
+        # Range view — one bookings query for the whole span, then one line per day
+        time_slots_by_date = open_day_slots(schedule, days)
+        slots_by_date = await get_court_available_slots_range(db, court_id, time_slots_by_date)
+        logger.info("Court availability: id=%s %s → %s (%d days, %d open)", court_id, start_date, end_date, len(days), len(time_slots_by_date))
+        return stream_days("court_id", court_id, days, time_slots_by_date, slots_by_date)
 
     # Look up today's day-of-week in the establishment's schedule
-    day_name = _WEEKDAYS[date.weekday()]
-    day = (est.schedule or {}).get(day_name, {}) if est else {}
+    day_name, day = day_hours(schedule, date)
 
     if day.get("closed", False):
         logger.info("Court availability: id=%s date=%s (%s) → CLOSED", court_id, date, day_name)
@@ -66,14 +127,24 @@ async def court_availability(
 @router.get("/coach/{coach_id}")
 async def coach_availability(
     coach_id: str,
-    date: date = Query(...),
+    date: date | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
+    days = requested_days(date, start_date, end_date)
+
     coach_row = await db.execute(select(Coach).where(Coach.id == coach_id))
     coach = coach_row.scalar_one_or_none()
+    schedule = coach.schedule if coach else None
+
+    if date is None:
+        time_slots_by_date = open_day_slots(schedule, days)
+        slots_by_date = await get_coach_available_slots_range(db, coach_id, time_slots_by_date)
+        logger.info("Coach availability: id=%s %s → %s (%d days, %d open)", coach_id, start_date, end_date, len(days), len(time_slots_by_date))
+        return stream_days("coach_id", coach_id, days, time_slots_by_date, slots_by_date)
 
-    day_name = _WEEKDAYS[date.weekday()]
-    day = (coach.schedule or {}).get(day_name, {}) if coach else {}
+    day_name, day = day_hours(schedule, date)
 
     if day.get("closed", False):
         logger.info("Coach availability: id=%s date=%s (%s) → UNAVAILABLE", coach_id, date, day_name)
@@ -87,3 +158,60 @@ async def coach_availability(
     available = sum(1 for s in slots if s["is_available"])
     logger.info("Coach availability: id=%s date=%s (%s) %s–%s → %d/%d free", coach_id, date, day_name, open_time, close_time, available, len(slots))
     return {"coach_id": coach_id, "date": str(date), "slots": slots, "closed": False}
+
+
+@router.get("/establishment/{establishment_id}")
+async def establishment_availability(
+    establishment_id: str,
+    date: date = Query(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """Courts × slots availability grid for a whole venue, from one grouped bookings query."""
+    est_row = await db.execute(
+        select(Establishment)
+        .where(Establishment.id == establishment_id)
+        .options(selectinload(Establishment.courts))
+    )
+    est = est_row.scalar_one_or_none()
+    if not est:
+        raise HTTPException(status_code=404, detail="Establishment not found")
+
+    courts = sorted((c for c in est.courts if c.is_active), key=lambda c: c.name)
+
+    # The schedule is shared by every court of the venue, so it is resolved once
+    day_name, day = day_hours(est.schedule, date)
+
+    if day.get("closed", False):
+        logger.info("Establishment availability: id=%s date=%s (%s) → CLOSED", establishment_id, date, day_name)
+        return {
+            "establishment_id": establishment_id,
+            "date": str(date),
+            "slots": [],
+            "courts": [{"court_id": str(c.id), "court_name": c.name, "availability": []} for c in courts],
+            "closed": True,
+        }
+
+    open_time  = day.get("open",  _DEFAULT_OPEN)
+    close_time = day.get("close", _DEFAULT_CLOSE)
+    time_slots = generate_slots(open_time, close_time)
+
+    by_court = await get_courts_available_slots(db, [c.id for c in courts], date, time_slots)
+    rows = [
+        {
+            "court_id": str(c.id),
+            "court_name": c.name,
+            "availability": [s["is_available"] for s in by_court[c.id]],
+        }
+        for c in courts
+    ]
+    logger.info(
+        "Establishment availability: id=%s date=%s (%s) %s–%s → %d courts × %d slots",
+        establishment_id, date, day_name, open_time, close_time, len(rows), len(time_slots) - 1
+    )
+    return {
+        "establishment_id": establishment_id,
+        "date": str(date),
+        "slots": [{"start_time": s, "end_time": e} for s, e in zip(time_slots, time_slots[1:])],
+        "courts": rows,
+        "closed": False,
+    }
@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, and_
+from sqlalchemy.exc import IntegrityError
 from app.database import get_db
 from app.models.booking import Booking
 from app.models.court import Court
@@ -10,18 +11,14 @@ from app.models.coach import Coach
 from app.models.user import User
 from app.schemas.booking import BookingCreate, BookingOut
 from app.dependencies import get_current_user
-from app.services.availability import is_court_available, is_coach_available
+from app.services.availability import is_coach_available, invalidate_availability
+from app.services.booking import overlap_violation, lock_coach_day, COURT_OVERLAP_CONSTRAINT
+from app.timeutil import duration_hours
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
 
 
-def calculate_duration_hours(start: str, end: str) -> float:
-    sh, sm = map(int, start.split(":"))
-    eh, em = map(int, end.split(":"))
-    return ((eh * 60 + em) - (sh * 60 + sm)) / 60
-
-
 @router.post("/", response_model=BookingOut, status_code=201)
 async def create_booking(
     payload: BookingCreate,
@@ -34,13 +31,10 @@ async def create_booking(
     if not court or not court.is_active:
         raise HTTPException(status_code=404, detail="Court not found")
 
-    # Check court availability
-    if not await is_court_available(db, str(payload.court_id), payload.date, payload.start_time, payload.end_time):
-        logger.warning("Court %s unavailable on %s %s-%s", payload.court_id, payload.date, payload.start_time, payload.end_time)
-        raise HTTPException(status_code=409, detail="Court is not available for the selected time slot")
+    # Court overlap is enforced by the ex_bookings_court_overlap constraint at insert time
 
     # Calculate price
-    duration = calculate_duration_hours(payload.start_time, payload.end_time)
+    duration = duration_hours(payload.start_minute, payload.end_minute)
     total_price = court.price_per_hour * duration
 
     # Handle optional coach combo
@@ -51,8 +45,9 @@ async def create_booking(
         if not coach or not coach.is_active:
             raise HTTPException(status_code=404, detail="Coach not found")
 
-        # CRITICAL: Check coach availability across BOTH booking tables
-        if not await is_coach_available(db, str(payload.coach_id), payload.date, payload.start_time, payload.end_time):
+        # CRITICAL: Check coach availability across BOTH booking tables, under the coach-day lock
+        await lock_coach_day(db, str(payload.coach_id), payload.date)
+        if not await is_coach_available(db, str(payload.coach_id), payload.date, payload.start_minute, payload.end_minute):
             logger.warning("Coach %s unavailable on %s %s-%s", payload.coach_id, payload.date, payload.start_time, payload.end_time)
             raise HTTPException(status_code=409, detail="Coach is not available for the selected time slot")
 
@@ -64,14 +59,28 @@ async def create_booking(
         user_id=current_user.id,
         coach_id=coach_id,
         date=payload.date,
-        start_time=payload.start_time,
-        end_time=payload.end_time,
+        start_minute=payload.start_minute,
+        end_minute=payload.end_minute,
         total_price=total_price,
         include_coach=payload.include_coach,
     )
     db.add(booking)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        violated = overlap_violation(exc)
+        if violated is None:
+            raise
+        if violated == COURT_OVERLAP_CONSTRAINT:
+            logger.warning("Court %s unavailable on %s %s-%s", payload.court_id, payload.date, payload.start_time, payload.end_time)
+            raise HTTPException(status_code=409, detail="Court is not available for the selected time slot")
+        logger.warning("Coach %s unavailable on %s %s-%s", payload.coach_id, payload.date, payload.start_time, payload.end_time)
+        raise HTTPException(status_code=409, detail="Coach is not available for the selected time slot")
     await db.refresh(booking)
+    invalidate_availability("court", payload.court_id, payload.date)
+    if coach_id:
+        invalidate_availability("coach", coach_id, payload.date)
     logger.info(
         "Booking created: id=%s user=%s court=%s date=%s %s-%s total=₱%.2f%s",
         booking.id, current_user.email, court.name, payload.date,
@@ -86,24 +95,32 @@ async def my_bookings(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # Enrich each booking with court, establishment, and optional coach details in one joined query
     result = await db.execute(
-        select(Booking).where(Booking.user_id == current_user.id).order_by(Booking.date.desc())
+        select(
+            Booking,
+            Court.name.label("court_name"),
+            Establishment.name.label("est_name"),
+            Establishment.location.label("est_location"),
+            Establishment.latitude.label("est_latitude"),
+            Establishment.longitude.label("est_longitude"),
+            Coach.name.label("coach_name"),
+            Coach.avatar_url.label("coach_avatar_url"),
+            Coach.bio.label("coach_bio"),
+        )
+        .outerjoin(Court, Court.id == Booking.court_id)
+        .outerjoin(Establishment, Establishment.id == Court.establishment_id)
+        .outerjoin(Coach, and_(Coach.id == Booking.coach_id, Booking.include_coach == True))
+        .where(Booking.user_id == current_user.id)
+        .order_by(Booking.date.desc())
     )
-    bookings = result.scalars().all()
+    rows = result.all()
 
-    # Enrich each booking with court, establishment, and optional coach details
     enriched = []
-    for b in bookings:
-        court_res = await db.execute(select(Court).where(Court.id == b.court_id))
-        court = court_res.scalar_one_or_none()
-        est = None
-        if court:
-            est_res = await db.execute(select(Establishment).where(Establishment.id == court.establishment_id))
-            est = est_res.scalar_one_or_none()
-        coach = None
-        if b.include_coach and b.coach_id:
-            coach_res = await db.execute(select(Coach).where(Coach.id == b.coach_id))
-            coach = coach_res.scalar_one_or_none()
+    for row in rows:
+        b = row.Booking
+        has_est = row.est_name is not None
+        has_coach = row.coach_name is not None
         enriched.append(BookingOut(
             id=b.id,
             court_id=b.court_id,
@@ -116,17 +133,17 @@ async def my_bookings(
             include_coach=b.include_coach,
             status=b.status,
             created_at=b.created_at,
-            court_name=court.name if court else "",
-            establishment_name=est.name if est else "",
-            establishment_location=est.location if est else "",
-            establishment_latitude=est.latitude if est else None,
-            establishment_longitude=est.longitude if est else None,
-            coach_name=coach.name if coach else "",
-            coach_avatar_url=coach.avatar_url if coach else None,
-            coach_bio=coach.bio if coach else "",
+            court_name=row.court_name or "",
+            establishment_name=row.est_name if has_est else "",
+            establishment_location=row.est_location if has_est else "",
+            establishment_latitude=row.est_latitude,
+            establishment_longitude=row.est_longitude,
+            coach_name=row.coach_name if has_coach else "",
+            coach_avatar_url=row.coach_avatar_url,
+            coach_bio=row.coach_bio or "",
         ))
 
-    logger.info("Listed %d court bookings for %s", len(bookings), current_user.email)
+    logger.info("Listed %d court bookings for %s", len(rows), current_user.email)
     return enriched
 
 
@@ -144,4 +161,7 @@ async def cancel_booking(
         raise HTTPException(status_code=403, detail="Not authorized")
     booking.status = "cancelled"
     await db.commit()
+    invalidate_availability("court", booking.court_id, booking.date)
+    if booking.include_coach and booking.coach_id:
+        invalidate_availability("coach", booking.coach_id, booking.date)
     logger.info("Booking cancelled: id=%s by user=%s", booking_id, current_user.email)
@@ -2,24 +2,21 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from app.database import get_db
 from app.models.coach_booking import CoachBooking
 from app.models.coach import Coach
 from app.models.user import User
 from app.schemas.coach_booking import CoachBookingCreate, CoachBookingOut
 from app.dependencies import get_current_user
-from app.services.availability import is_coach_available
+from app.services.availability import is_coach_available, invalidate_availability
+from app.services.booking import overlap_violation, lock_coach_day
+from app.timeutil import duration_hours
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
 
 
-def calculate_duration_hours(start: str, end: str) -> float:
-    sh, sm = map(int, start.split(":"))
-    eh, em = map(int, end.split(":"))
-    return ((eh * 60 + em) - (sh * 60 + sm)) / 60
-
-
 @router.post("/", response_model=CoachBookingOut, status_code=201)
 async def create_coach_booking(
     payload: CoachBookingCreate,
@@ -32,26 +29,40 @@ async def create_coach_booking(
         logger.warning("Coach booking failed — coach not found: id=%s", payload.coach_id)
         raise HTTPException(status_code=404, detail="Coach not found")
 
-    if not await is_coach_available(db, str(payload.coach_id), payload.date, payload.start_time, payload.end_time):
+    # Combo bookings for this coach live in another table, so check both under the coach-day lock
+    await lock_coach_day(db, str(payload.coach_id), payload.date)
+    if not await is_coach_available(db, str(payload.coach_id), payload.date, payload.start_minute, payload.end_minute):
         logger.warning(
             "Coach booking conflict: coach='%s' date=%s %s-%s requested by %s",
             coach.name, payload.date, payload.start_time, payload.end_time, current_user.email
         )
         raise HTTPException(status_code=409, detail="Coach is not available for the selected time slot")
 
-    duration = calculate_duration_hours(payload.start_time, payload.end_time)
+    duration = duration_hours(payload.start_minute, payload.end_minute)
     total_price = coach.rate_per_hour * duration
     booking = CoachBooking(
         coach_id=payload.coach_id,
         user_id=current_user.id,
         date=payload.date,
-        start_time=payload.start_time,
-        end_time=payload.end_time,
+        start_minute=payload.start_minute,
+        end_minute=payload.end_minute,
         total_price=total_price,
     )
     db.add(booking)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if overlap_violation(exc) is None:
+            raise
+        # Rollback expired the loaded rows, so log from the payload only
+        logger.warning(
+            "Coach booking conflict: coach=%s date=%s %s-%s (concurrent insert)",
+            payload.coach_id, payload.date, payload.start_time, payload.end_time
+        )
+        raise HTTPException(status_code=409, detail="Coach is not available for the selected time slot")
     await db.refresh(booking)
+    invalidate_availability("coach", payload.coach_id, payload.date)
     logger.info(
         "Coach booking created: id=%s coach='%s' date=%s %s-%s total=₱%.2f by %s",
         booking.id, coach.name, payload.date, payload.start_time, payload.end_time,
@@ -66,14 +77,22 @@ async def my_coach_bookings(
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
-        select(CoachBooking).where(CoachBooking.user_id == current_user.id).order_by(CoachBooking.date.desc())
+        select(
+            CoachBooking,
+            Coach.name.label("coach_name"),
+            Coach.avatar_url.label("coach_avatar_url"),
+            Coach.bio.label("coach_bio"),
+        )
+        .outerjoin(Coach, Coach.id == CoachBooking.coach_id)
+        .where(CoachBooking.user_id == current_user.id)
+        .order_by(CoachBooking.date.desc())
     )
-    bookings = result.scalars().all()
+    rows = result.all()
 
     enriched = []
-    for b in bookings:
-        coach_res = await db.execute(select(Coach).where(Coach.id == b.coach_id))
-        coach = coach_res.scalar_one_or_none()
+    for row in rows:
+        b = row.CoachBooking
+        has_coach = row.coach_name is not None
         enriched.append(CoachBookingOut(
             id=b.id,
             coach_id=b.coach_id,
@@ -84,12 +103,12 @@ async def my_coach_bookings(
             total_price=b.total_price,
             status=b.status,
             created_at=b.created_at,
-            coach_name=coach.name if coach else "",
-            coach_avatar_url=coach.avatar_url if coach else None,
-            coach_bio=coach.bio if coach else "",
+            coach_name=row.coach_name if has_coach else "",
+            coach_avatar_url=row.coach_avatar_url,
+            coach_bio=row.coach_bio or "",
         ))
 
-    logger.info("Listed %d coach bookings for %s", len(bookings), current_user.email)
+    logger.info("Listed %d coach bookings for %s", len(rows), current_user.email)
     return enriched
 
 
@@ -109,4 +128,5 @@ async def cancel_coach_booking(
         raise HTTPException(status_code=403, detail="Not authorized")
     booking.status = "cancelled"
     await db.commit()
+    invalidate_availability("coach", booking.coach_id, booking.date)
     logger.info("Coach booking cancelled: id=%s by %s", booking_id, current_user.email)
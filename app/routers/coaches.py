@@ -1,5 +1,5 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm.attributes import flag_modified
@@ -8,6 +8,9 @@ from app.models.coach import Coach
 from app.models.user import User
 from app.schemas.coach import CoachCreate, CoachUpdate, CoachOut
 from app.dependencies import get_current_user
+from app.services.availability import invalidate_availability
+from app.services.pagination import after_created, created_cursor
+from app.http_cache import etag_for, not_modified
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
@@ -15,25 +18,43 @@ logger = logging.getLogger("dinkr")
 
 @router.get("/", response_model=list[CoachOut])
 async def list_coaches(
-    skip: int = 0,
-    limit: int = 20,
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
-    result = await db.execute(
-        select(Coach).where(Coach.is_active == True).offset(skip).limit(limit)
-    )
+    """
+    Active coaches, oldest first, keyset-paginated on (created_at, id).
+    The X-Next-Cursor response header holds the cursor for the next page and is absent on the last one.
+    """
+    try:
+        query = select(Coach).where(Coach.is_active == True, after_created(Coach, cursor))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if skip and not cursor:
+        query = query.offset(skip)  # legacy offset paging; cursors stay an index seek at any depth
+    result = await db.execute(query.order_by(Coach.created_at, Coach.id).limit(limit + 1))
     coaches = result.scalars().all()
-    logger.info("Listed %d coaches (skip=%d limit=%d)", len(coaches), skip, limit)
-    return coaches
+    if cached := not_modified(request, response, etag_for(coaches)):
+        return cached
+    page = coaches[:limit]
+    if len(coaches) > limit:
+        response.headers["X-Next-Cursor"] = created_cursor(page[-1])
+    logger.info("Listed %d coaches (limit=%d%s)", len(page), limit, ", from cursor" if cursor else "")
+    return page
 
 
 @router.get("/{coach_id}", response_model=CoachOut)
-async def get_coach(coach_id: str, db: AsyncSession = Depends(get_db)):
+async def get_coach(coach_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Coach).where(Coach.id == coach_id))
     coach = result.scalar_one_or_none()
     if not coach:
         logger.warning("Coach not found: id=%s", coach_id)
         raise HTTPException(status_code=404, detail="Coach not found")
+    if cached := not_modified(request, response, etag_for([coach])):
+        return cached
     logger.info("Fetched coach: '%s' (id=%s)", coach.name, coach_id)
     return coach
 
@@ -74,6 +95,8 @@ async def update_coach(
             flag_modified(coach, 'schedule')
     await db.commit()
     await db.refresh(coach)
+    if 'schedule' in updated_fields:
+        invalidate_availability("coach", coach.id)
     logger.info("Coach updated: '%s' (id=%s) fields=%s by %s", coach.name, coach_id, updated_fields, current_user.email)
     return coach
 
@@ -1,21 +1,24 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.models.court import Court
 from app.schemas.court import CourtOut
+from app.http_cache import etag_for, not_modified
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
 
 
 @router.get("/{court_id}", response_model=CourtOut)
-async def get_court(court_id: str, db: AsyncSession = Depends(get_db)):
+async def get_court(court_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Court).where(Court.id == court_id))
     court = result.scalar_one_or_none()
     if not court:
         logger.warning("Court not found: id=%s", court_id)
         raise HTTPException(status_code=404, detail="Court not found")
+    if cached := not_modified(request, response, etag_for([court])):
+        return cached
     logger.info("Fetched court: '%s' (id=%s)", court.name, court_id)
     return court
@@ -1,15 +1,24 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified
 from app.database import get_db
 from app.models.establishment import Establishment
 from app.models.court import Court
 from app.models.user import User
-from app.schemas.establishment import EstablishmentCreate, EstablishmentUpdate, EstablishmentOut, EstablishmentWithCourts
+from app.schemas.establishment import (
+    EstablishmentCreate, EstablishmentUpdate, EstablishmentOut, EstablishmentWithCourts,
+    EstablishmentNearby, EstablishmentSearchResult,
+)
 from app.schemas.court import CourtCreate, CourtUpdate, CourtOut
 from app.dependencies import get_current_user
+from app.services.availability import invalidate_availability
+from app.services.geo import haversine_km, within_box
+from app.services.search import matches, relevance
+from app.services.pagination import after_created, created_cursor
+from app.http_cache import etag_for, not_modified
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
@@ -19,27 +28,112 @@ logger = logging.getLogger("dinkr")
 
 @router.get("/", response_model=list[EstablishmentOut])
 async def list_establishments(
-    skip: int = 0,
-    limit: int = 20,
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
     location: str | None = None,
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(Establishment).where(Establishment.is_active == True)
+    """
+    Active establishments, oldest first, keyset-paginated on (created_at, id).
+    The X-Next-Cursor response header holds the cursor for the next page and is absent on the last one.
+    """
+    try:
+        query = select(Establishment).where(Establishment.is_active == True, after_created(Establishment, cursor))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     if location:
         query = query.where(Establishment.location.ilike(f"%{location}%"))
-    result = await db.execute(query.offset(skip).limit(limit))
+    if skip and not cursor:
+        query = query.offset(skip)  # legacy offset paging; cursors stay an index seek at any depth
+    result = await db.execute(query.order_by(Establishment.created_at, Establishment.id).limit(limit + 1))
     ests = result.scalars().all()
-    logger.info("Listed %d establishments (location=%s)", len(ests), location or "*")
-    return ests
+    if cached := not_modified(request, response, etag_for(ests)):
+        return cached
+    page = ests[:limit]
+    if len(ests) > limit:
+        response.headers["X-Next-Cursor"] = created_cursor(page[-1])
+    logger.info("Listed %d establishments (location=%s)", len(page), location or "*")
+    return page
+
+
+@router.get("/nearby", response_model=list[EstablishmentNearby])
+async def nearby_establishments(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Active establishments within radius_km of (lat, lng), nearest first.
+    A bounding-box range on the (latitude, longitude) index narrows the candidates; exact
+    haversine distance then filters and ranks them.
+    """
+    distance = haversine_km(Establishment.latitude, Establishment.longitude, lat, lng)
+    result = await db.execute(
+        select(Establishment, distance)
+        .where(
+            Establishment.is_active == True,
+            within_box(Establishment.latitude, Establishment.longitude, lat, lng, radius_km),
+            distance <= radius_km,
+        )
+        .order_by(distance, Establishment.id)
+        .limit(limit)
+    )
+    rows = result.all()
+    logger.info("Nearby search (%.4f, %.4f, %g km): %d establishments", lat, lng, radius_km, len(rows))
+    return [
+        EstablishmentNearby(**EstablishmentOut.model_validate(est).model_dump(), distance_km=round(km, 3))
+        for est, km in rows
+    ]
+
+
+@router.get("/search", response_model=list[EstablishmentSearchResult])
+async def search_establishments(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Active establishments whose name, location or description matches q, most relevant first.
+    Trigram matching tolerates typos and partial words; the GIN index keeps it off a sequential scan.
+    """
+    score = relevance(q)
+    result = await db.execute(
+        select(Establishment, score)
+        .where(Establishment.is_active == True, matches(q))
+        .order_by(score.desc(), Establishment.id)
+        .limit(limit)
+    )
+    rows = result.all()
+    logger.info("Search '%s': %d establishments", q, len(rows))
+    return [
+        EstablishmentSearchResult(**EstablishmentOut.model_validate(est).model_dump(), relevance=round(rank, 4))
+        for est, rank in rows
+    ]
 
 
 @router.get("/{establishment_id}", response_model=EstablishmentWithCourts)
-async def get_establishment(establishment_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Establishment).where(Establishment.id == establishment_id))
+async def get_establishment(
+    establishment_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    result = await db.execute(
+        select(Establishment)
+        .where(Establishment.id == establishment_id)
+        .options(selectinload(Establishment.courts))
+    )
     est = result.scalar_one_or_none()
     if not est:
         logger.warning("Establishment not found: id=%s", establishment_id)
         raise HTTPException(status_code=404, detail="Establishment not found")
+    if cached := not_modified(request, response, etag_for([est, *est.courts])):
+        return cached
     logger.info("Fetched establishment: '%s' (id=%s)", est.name, establishment_id)
     return est
 
@@ -80,6 +174,10 @@ async def update_establishment(
             flag_modified(est, 'schedule')
     await db.commit()
     await db.refresh(est)
+    if 'schedule' in updated_fields:
+        court_ids = await db.execute(select(Court.id).where(Court.establishment_id == est.id))
+        for court_id in court_ids.scalars().all():
+            invalidate_availability("court", court_id)
     logger.info("Establishment updated: '%s' (id=%s) fields=%s by %s", est.name, establishment_id, updated_fields, current_user.email)
     return est
 
@@ -106,7 +204,12 @@ async def delete_establishment(
 # ── Courts nested under Establishment ──────────────────────────────────────
 
 @router.get("/{establishment_id}/courts", response_model=list[CourtOut])
-async def list_courts(establishment_id: str, db: AsyncSession = Depends(get_db)):
+async def list_courts(
+    establishment_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     result = await db.execute(
         select(Court).where(
             Court.establishment_id == establishment_id,
@@ -114,6 +217,8 @@ async def list_courts(establishment_id: str, db: AsyncSession = Depends(get_db))
         )
     )
     courts = result.scalars().all()
+    if cached := not_modified(request, response, etag_for(courts)):
+        return cached
     logger.info("Listed %d courts for est=%s", len(courts), establishment_id)
     return courts
 
@@ -0,0 +1,156 @@
+import logging
+from typing import Literal
+from uuid import UUID as PyUUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, cast, literal, literal_column, null, true, tuple_, union_all, String
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import date
+from app.database import get_db
+from app.models.booking import Booking
+from app.models.coach_booking import CoachBooking
+from app.models.court import Court
+from app.models.establishment import Establishment
+from app.models.coach import Coach
+from app.models.user import User
+from app.schemas.schedule import ScheduleItem, SchedulePage
+from app.dependencies import get_current_user
+from app.services.pagination import encode_cursor, decode_cursor
+from app.timeutil import to_hhmm
+
+router = APIRouter()
+logger = logging.getLogger("dinkr")
+
+
+def _parse_cursor(cursor: str | None) -> tuple | None:
+    """Turn an opaque cursor back into the (date, start_minute, id) key of the last row served."""
+    if not cursor:
+        return None
+    try:
+        values = decode_cursor(cursor)
+        return date.fromisoformat(values["d"]), int(values["m"]), PyUUID(values["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(columns, after: tuple | None, descending: bool):
+    """Keyset predicate: rows strictly after the cursor in (date, start_minute, id) order."""
+    if after is None:
+        return true()
+    day, minute, row_id = after
+    key = tuple_(*columns)
+    bound = tuple_(literal(day), literal(minute), literal(row_id, UUID(as_uuid=True)))
+    return key < bound if descending else key > bound
+
+
+@router.get("/my", response_model=SchedulePage)
+async def my_schedule(
+    when: Literal["upcoming", "past"] = "upcoming",
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Court and coach bookings for the current user as one timeline, keyset-paginated.
+    Upcoming entries run soonest first; past entries run most recent first.
+    """
+    after = _parse_cursor(cursor)
+    today = date.today()
+    descending = when == "past"
+
+    def ordered(query, columns):
+        # Each branch is filtered and limited on its own so Postgres can walk the per-user indexes
+        return query.order_by(*(c.desc() if descending else c for c in columns)).limit(limit + 1)
+
+    court_key = (Booking.date, Booking.start_minute, Booking.id)
+    court_rows = ordered(
+        select(
+            literal_column("'court'").label("kind"),
+            Booking.id.label("id"),
+            Booking.date.label("date"),
+            Booking.start_minute.label("start_minute"),
+            Booking.end_minute.label("end_minute"),
+            Booking.total_price.label("total_price"),
+            Booking.status.label("status"),
+            Booking.created_at.label("created_at"),
+            Booking.court_id.label("court_id"),
+            Court.name.label("court_name"),
+            Establishment.name.label("establishment_name"),
+            Establishment.location.label("establishment_location"),
+            Coach.id.label("coach_id"),
+            Coach.name.label("coach_name"),
+        )
+        .outerjoin(Court, Court.id == Booking.court_id)
+        .outerjoin(Establishment, Establishment.id == Court.establishment_id)
+        .outerjoin(Coach, and_(Coach.id == Booking.coach_id, Booking.include_coach == True))
+        .where(
+            Booking.user_id == current_user.id,
+            Booking.date < today if descending else Booking.date >= today,
+            _after_cursor(court_key, after, descending),
+        ),
+        court_key,
+    )
+
+    coach_key = (CoachBooking.date, CoachBooking.start_minute, CoachBooking.id)
+    coach_rows = ordered(
+        select(
+            literal_column("'coach'").label("kind"),
+            CoachBooking.id.label("id"),
+            CoachBooking.date.label("date"),
+            CoachBooking.start_minute.label("start_minute"),
+            CoachBooking.end_minute.label("end_minute"),
+            CoachBooking.total_price.label("total_price"),
+            CoachBooking.status.label("status"),
+            CoachBooking.created_at.label("created_at"),
+            cast(null(), UUID(as_uuid=True)).label("court_id"),
+            cast(null(), String).label("court_name"),
+            cast(null(), String).label("establishment_name"),
+            cast(null(), String).label("establishment_location"),
+            CoachBooking.coach_id.label("coach_id"),
+            Coach.name.label("coach_name"),
+        )
+        .outerjoin(Coach, Coach.id == CoachBooking.coach_id)
+        .where(
+            CoachBooking.user_id == current_user.id,
+            CoachBooking.date < today if descending else CoachBooking.date >= today,
+            _after_cursor(coach_key, after, descending),
+        ),
+        coach_key,
+    )
+
+    timeline = union_all(court_rows, coach_rows).subquery()
+    result = await db.execute(
+        select(timeline).order_by(
+            *(c.desc() if descending else c for c in (timeline.c.date, timeline.c.start_minute, timeline.c.id))
+        ).limit(limit + 1)
+    )
+    rows = result.all()
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor({"d": last.date.isoformat(), "m": last.start_minute, "id": str(last.id)})
+
+    items = [
+        ScheduleItem(
+            kind=row.kind,
+            id=row.id,
+            date=row.date,
+            start_time=to_hhmm(row.start_minute),
+            end_time=to_hhmm(row.end_minute),
+            total_price=row.total_price,
+            status=row.status,
+            created_at=row.created_at,
+            court_id=row.court_id,
+            court_name=row.court_name or "",
+            establishment_name=row.establishment_name or "",
+            establishment_location=row.establishment_location or "",
+            coach_id=row.coach_id,
+            coach_name=row.coach_name or "",
+        )
+        for row in page
+    ]
+    logger.info("Schedule (%s) for %s: %d items%s", when, current_user.email, len(items), " +more" if next_cursor else "")
+    return SchedulePage(items=items, next_cursor=next_cursor)
@@ -1,8 +1,26 @@
+import hashlib
 import logging
+import time
+from typing import BinaryIO, Callable, Literal
 import cloudinary
+import cloudinary.api
+import cloudinary.exceptions
 import cloudinary.uploader
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import cloudinary.utils
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from python_multipart.exceptions import FormParserError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 from app.config import settings
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.models.image_upload import ImageUpload
+from app.models.user import User
 
 router = APIRouter()
 logger = logging.getLogger("dinkr")
@@ -21,12 +39,50 @@ PHOTO_MAX_BYTES  = 5  * 1024 * 1024  #    5 MB
 AVATAR_MIN_BYTES = 30  * 1024        #   30 KB
 AVATAR_MAX_BYTES = 3  * 1024 * 1024  #    3 MB
 
+# Headroom for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+HASH_CHUNK_BYTES = 64 * 1024
 
-def _validate(contents: bytes, content_type: str, min_bytes: int, max_bytes: int, label: str) -> None:
+# Direct uploads: Cloudinary rejects signatures older than an hour; we advertise a shorter window
+SIGNED_UPLOAD_TTL_SECONDS = 10 * 60
+SIGNED_UPLOAD_FORMATS = "jpg,png,webp,gif"
+
+# kind → (folder, min bytes, max bytes, label)
+_KINDS = {
+    "photo":  ("photos",  PHOTO_MIN_BYTES,  PHOTO_MAX_BYTES,  "Photo"),
+    "avatar": ("avatars", AVATAR_MIN_BYTES, AVATAR_MAX_BYTES, "Avatar"),
+}
+
+# Documents the multipart body for /docs, since the routes parse it themselves
+_FILE_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+Uploader = Callable[[BinaryIO, str], str]
+
+
+def _too_large(label: str, max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"{label} is too large. Maximum is {max_bytes // (1024*1024)} MB."
+    )
+
+
+def _validate(size: int, content_type: str, min_bytes: int, max_bytes: int, label: str) -> None:
     if content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Only JPEG, PNG, WebP, and GIF images are accepted.")
 
-    size = len(contents)
     if size < min_bytes:
         raise HTTPException(
             status_code=400,
@@ -39,30 +95,213 @@ def _validate(contents: bytes, content_type: str, min_bytes: int, max_bytes: int
         )
 
 
-def _upload(contents: bytes, folder: str) -> str:
+class _ImageFormParser(MultiPartParser):
+    """MultiPartParser that releases spooled parts whenever parsing stops early, and reports malformed bodies."""
+
+    async def parse(self):
+        try:
+            return await super().parse()
+        except BaseException as exc:
+            for part in self._files_to_close_on_error:
+                part.close()
+            if isinstance(exc, FormParserError):
+                raise MultiPartException(f"Malformed multipart body: {exc}") from exc
+            raise
+
+
+async def _receive_image(request: Request, min_bytes: int, max_bytes: int, label: str) -> UploadFile:
+    """
+    Parse the multipart body while it streams in, aborting as soon as it exceeds the size limit.
+    The file part is spooled to a temporary file (only the first MB stays in memory), never fully buffered.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body.")
+    limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise _too_large(label, max_bytes)
+
+    async def limited_stream():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise _too_large(label, max_bytes)
+            yield chunk
+
+    try:
+        form = await _ImageFormParser(request.headers, limited_stream(), max_files=1, max_fields=0).parse()
+    except MultiPartException as exc:
+        raise HTTPException(status_code=400, detail=exc.message) from exc
+
+    file = form.get("file")
+    if not isinstance(file, UploadFile):
+        await form.close()
+        raise HTTPException(status_code=400, detail="Missing 'file' field.")
+    try:
+        _validate(file.size or 0, file.content_type or "", min_bytes, max_bytes, label)
+    except HTTPException:
+        await file.close()
+        raise
+    await file.seek(0)
+    return file
+
+
+def _cloudinary_upload(fileobj: BinaryIO, folder: str) -> str:
     result = cloudinary.uploader.upload(
-        contents,
+        fileobj,
         folder=f"dinkr/{folder}",
         resource_type="image",
     )
     return result["secure_url"]
 
 
-@router.post("/photo")
-async def upload_photo(file: UploadFile = File(...)):
+def get_uploader() -> Uploader:
+    """Upload target for image bytes. Override this dependency to point uploads at a local fake."""
+    return _cloudinary_upload
+
+
+def _sha256(fileobj: BinaryIO) -> str:
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+async def _store(db: AsyncSession, uploader: Uploader, file: UploadFile, folder: str) -> tuple[str, bool]:
+    """
+    Return the storage URL for file and whether it was already known.
+    Identical bytes uploaded to the same folder before are answered from the image_uploads index
+    without touching storage; otherwise the file is pushed and indexed.
+    """
+    try:
+        # Hashing and the blocking upstream client both run on the thread pool, not the event loop
+        sha256 = await run_in_threadpool(_sha256, file.file)
+        existing = await db.execute(
+            select(ImageUpload.secure_url).where(ImageUpload.sha256 == sha256, ImageUpload.folder == folder)
+        )
+        url = existing.scalar_one_or_none()
+        if url:
+            return url, True
+        url = await run_in_threadpool(uploader, file.file, folder)
+    finally:
+        await file.close()
+
+    db.add(ImageUpload(sha256=sha256, folder=folder, secure_url=url, size_bytes=file.size or 0))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent upload of the same bytes indexed it first — either URL is fine
+        await db.rollback()
+    return url, False
+
+
+@router.post("/photo", openapi_extra=_FILE_BODY)
+async def upload_photo(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    uploader: Uploader = Depends(get_uploader)
+):
     """Establishment and court photos. Min 100 KB · Max 5 MB."""
-    contents = await file.read()
-    _validate(contents, file.content_type or "", PHOTO_MIN_BYTES, PHOTO_MAX_BYTES, "Photo")
-    url = _upload(contents, "photos")
-    logger.info("Photo uploaded → %s", url)
+    file = await _receive_image(request, PHOTO_MIN_BYTES, PHOTO_MAX_BYTES, "Photo")
+    url, reused = await _store(db, uploader, file, "photos")
+    logger.info("Photo %s → %s", "deduplicated" if reused else "uploaded", url)
     return {"url": url}
 
 
-@router.post("/avatar")
-async def upload_avatar(file: UploadFile = File(...)):
+@router.post("/avatar", openapi_extra=_FILE_BODY)
+async def upload_avatar(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    uploader: Uploader = Depends(get_uploader)
+):
     """Coach profile avatars. Min 30 KB · Max 3 MB."""
-    contents = await file.read()
-    _validate(contents, file.content_type or "", AVATAR_MIN_BYTES, AVATAR_MAX_BYTES, "Avatar")
-    url = _upload(contents, "avatars")
-    logger.info("Avatar uploaded → %s", url)
+    file = await _receive_image(request, AVATAR_MIN_BYTES, AVATAR_MAX_BYTES, "Avatar")
+    url, reused = await _store(db, uploader, file, "avatars")
+    logger.info("Avatar %s → %s", "deduplicated" if reused else "uploaded", url)
     return {"url": url}
+
+
+
+# ── Signed direct-to-storage uploads ──────────────────────────────────────────
+class SignUploadPayload(BaseModel):
+    kind: Literal["photo", "avatar"]
+
+
+class ConfirmUploadPayload(BaseModel):
+    """Fields copied from the storage provider's upload response."""
+    kind: Literal["photo", "avatar"]
+    public_id: str
+    version: int
+    signature: str
+
+
+def _cloudinary_resource(public_id: str) -> dict:
+    return cloudinary.api.resource(public_id, resource_type="image")
+
+
+def _cloudinary_destroy(public_id: str) -> None:
+    cloudinary.uploader.destroy(public_id, resource_type="image", invalidate=True)
+
+
+@router.post("/sign")
+async def sign_upload(payload: SignUploadPayload, current_user: User = Depends(get_current_user)):
+    """
+    Issue short-lived signed parameters so the client can upload straight to storage.
+    Signing is a local HMAC — no upstream call and no file bytes pass through this API.
+    The signature pins the folder and allowed formats; size can only be checked on /confirm.
+    """
+    folder, min_bytes, max_bytes, _ = _KINDS[payload.kind]
+    timestamp = int(time.time())
+    params = {
+        "timestamp": timestamp,
+        "folder": f"dinkr/{folder}",
+        "allowed_formats": SIGNED_UPLOAD_FORMATS,
+    }
+    params["signature"] = cloudinary.utils.api_sign_request(params, settings.cloudinary_api_secret)
+    params["api_key"] = settings.cloudinary_api_key
+    logger.info("Signed direct %s upload (folder=%s) for %s", payload.kind, params["folder"], current_user.email)
+    return {
+        "upload_url": f"https://api.cloudinary.com/v1_1/{settings.cloudinary_cloud_name}/image/upload",
+        "params": params,
+        "min_bytes": min_bytes,
+        "max_bytes": max_bytes,
+        "expires_at": timestamp + SIGNED_UPLOAD_TTL_SECONDS,
+    }
+
+
+@router.post("/confirm")
+async def confirm_upload(payload: ConfirmUploadPayload, current_user: User = Depends(get_current_user)):
+    """
+    Accept a direct upload and return its canonical URL.
+    The response signature proves the asset came from our signed upload; its size and format are
+    read back from storage, never taken from the client. Assets outside the limits are deleted.
+    """
+    folder, min_bytes, max_bytes, label = _KINDS[payload.kind]
+    if not cloudinary.utils.verify_api_response_signature(payload.public_id, payload.version, payload.signature):
+        logger.warning("Direct upload confirm rejected — bad signature: public_id=%s", payload.public_id)
+        raise HTTPException(status_code=400, detail="Upload signature is invalid.")
+    if not payload.public_id.startswith(f"dinkr/{folder}/"):
+        raise HTTPException(status_code=400, detail=f"Upload is not in the {folder} folder.")
+
+    try:
+        asset = await run_in_threadpool(_cloudinary_resource, payload.public_id)
+    except cloudinary.exceptions.NotFound:
+        raise HTTPException(status_code=400, detail="Upload not found.")
+    if asset["version"] != payload.version:
+        raise HTTPException(status_code=400, detail="Upload was replaced; confirm the latest version.")
+
+    fmt = asset["format"]
+    try:
+        _validate(asset["bytes"], f"image/{'jpeg' if fmt == 'jpg' else fmt}", min_bytes, max_bytes, label)
+    except HTTPException:
+        logger.warning(
+            "Direct upload rejected and deleted: public_id=%s bytes=%d format=%s (%s)",
+            payload.public_id, asset["bytes"], fmt, current_user.email,
+        )
+        await run_in_threadpool(_cloudinary_destroy, payload.public_id)
+        raise
+
+    logger.info("Direct %s upload confirmed → %s", payload.kind, asset["secure_url"])
+    return {"url": asset["secure_url"]}
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, field_validator, model_validator
 from uuid import UUID
 from datetime import date, datetime
+from app.timeutil import to_minutes
 
 
 class BookingCreate(BaseModel):
@@ -11,12 +12,28 @@ class BookingCreate(BaseModel):
     include_coach: bool = False
     coach_id: UUID | None = None
 
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def check_time_format(cls, value: str) -> str:
+        to_minutes(value)
+        return value
+
     @model_validator(mode="after")
     def check_coach_required(self):
         if self.include_coach and not self.coach_id:
             raise ValueError("coach_id is required when include_coach is True")
+        if self.end_minute <= self.start_minute:
+            raise ValueError("end_time must be after start_time")
         return self
 
+    @property
+    def start_minute(self) -> int:
+        return to_minutes(self.start_time)
+
+    @property
+    def end_minute(self) -> int:
+        return to_minutes(self.end_time)
+
 
 class BookingOut(BaseModel):
     id: UUID
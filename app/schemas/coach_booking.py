@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 from uuid import UUID
 from datetime import date, datetime
+from app.timeutil import to_minutes
 
 
 class CoachBookingCreate(BaseModel):
@@ -9,6 +10,26 @@ class CoachBookingCreate(BaseModel):
     start_time: str
     end_time: str
 
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def check_time_format(cls, value: str) -> str:
+        to_minutes(value)
+        return value
+
+    @model_validator(mode="after")
+    def check_time_order(self):
+        if self.end_minute <= self.start_minute:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+    @property
+    def start_minute(self) -> int:
+        return to_minutes(self.start_time)
+
+    @property
+    def end_minute(self) -> int:
+        return to_minutes(self.end_time)
+
 
 class CoachBookingOut(BaseModel):
     id: UUID
@@ -57,6 +57,16 @@ class EstablishmentOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class EstablishmentNearby(EstablishmentOut):
+    """Search result — includes the distance from the requested point."""
+    distance_km: float
+
+
+class EstablishmentSearchResult(EstablishmentOut):
+    """Search result — includes the text-match relevance score (higher is better)."""
+    relevance: float
+
+
 class EstablishmentWithCourts(EstablishmentOut):
     """Used when fetching a single establishment — includes its courts."""
     courts: list[CourtOut] = []
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import date, datetime
+from typing import Literal
+
+
+class ScheduleItem(BaseModel):
+    """One entry of a user's timeline — either a court booking or a standalone coach booking."""
+    kind: Literal["court", "coach"]
+    id: UUID
+    date: date
+    start_time: str
+    end_time: str
+    total_price: float
+    status: str
+    created_at: datetime
+    court_id: UUID | None = None
+    court_name: str = ""
+    establishment_name: str = ""
+    establishment_location: str = ""
+    coach_id: UUID | None = None
+    coach_name: str = ""
+
+
+class SchedulePage(BaseModel):
+    items: list[ScheduleItem]
+    next_cursor: str | None = None
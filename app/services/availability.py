@@ -1,49 +1,62 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, union_all
 from app.models.booking import Booking
 from app.models.coach_booking import CoachBooking
+from app.services.cache import TTLCache
+from app.config import settings
+from app.timeutil import to_minutes
+from collections import defaultdict
 from datetime import date
 
+# Computed slot lists keyed by (resource type, resource id, date). Entries remember the slot
+# boundaries they were built for, so a schedule change never serves a mismatched grid.
+availability_cache = TTLCache(
+    "availability",
+    maxsize=settings.availability_cache_size,
+    ttl_seconds=settings.availability_cache_ttl_seconds,
+)
 
-def times_overlap(start1: str, end1: str, start2: str, end2: str) -> bool:
-    """Check if two time ranges overlap. Times are 'HH:MM' strings."""
-    return start1 < end2 and start2 < end1
 
+# Bumped by every invalidation of a resource. A reader captures it before querying and only stores
+# its result if it is unchanged, so a snapshot taken before a booking committed is never cached after
+# that booking's invalidation. Keyed per resource (not per day) so it stays bounded.
+_generations: dict[tuple[str, str], int] = {}
 
-async def is_court_available(
-    db: AsyncSession,
-    court_id: str,
-    booking_date: date,
-    start_time: str,
-    end_time: str,
-    exclude_booking_id: str | None = None
-) -> bool:
-    """Returns True if the court has no confirmed booking overlapping the given slot."""
-    query = select(Booking).where(
-        and_(
-            Booking.court_id == court_id,
-            Booking.date == booking_date,
-            Booking.status == "confirmed",
-        )
-    )
-    if exclude_booking_id:
-        query = query.where(Booking.id != exclude_booking_id)
 
-    result = await db.execute(query)
-    existing = result.scalars().all()
+def _generation(kind: str, resource_id) -> int:
+    return _generations.get((kind, str(resource_id)), 0)
 
-    for b in existing:
-        if times_overlap(start_time, end_time, b.start_time, b.end_time):
-            return False
-    return True
+
+def _cached_slots(kind: str, resource_id, day: date, time_slots: list[str]) -> list[dict] | None:
+    entry = availability_cache.get((kind, str(resource_id), day))
+    if entry is not None and entry[0] == tuple(time_slots):
+        return entry[1]
+    return None
+
+
+def _store_slots(kind: str, resource_id, day: date, time_slots: list[str], slots: list[dict], generation: int) -> None:
+    if _generation(kind, resource_id) != generation:
+        return  # invalidated while the intervals were being read — the result may predate the change
+    availability_cache.set((kind, str(resource_id), day), (tuple(time_slots), slots))
+
+
+def invalidate_availability(kind: str, resource_id, day: date | None = None) -> None:
+    """Drop cached availability for a "court" or "coach" — one day, or every day when day is None."""
+    key = (kind, str(resource_id))
+    _generations[key] = _generations.get(key, 0) + 1
+    if day is not None:
+        availability_cache.invalidate((kind, str(resource_id), day))
+        return
+    rid = str(resource_id)
+    availability_cache.invalidate_where(lambda key: key[0] == kind and key[1] == rid)
 
 
 async def is_coach_available(
     db: AsyncSession,
     coach_id: str,
     booking_date: date,
-    start_time: str,
-    end_time: str,
+    start_minute: int,
+    end_minute: int,
     exclude_booking_id: str | None = None,
     exclude_coach_booking_id: str | None = None
 ) -> bool:
@@ -52,40 +65,155 @@ async def is_coach_available(
     Checks BOTH the bookings table (combo bookings) AND the coach_bookings table (standalone).
     This is the critical dual-check for coach availability.
     """
-    # Check combo bookings (court bookings that include this coach)
-    q1 = select(Booking).where(
+    # Combo bookings (court bookings that include this coach)
+    q1 = select(Booking.id).where(
         and_(
             Booking.coach_id == coach_id,
             Booking.date == booking_date,
             Booking.status == "confirmed",
             Booking.include_coach == True,
+            Booking.start_minute < end_minute,
+            Booking.end_minute > start_minute,
         )
     )
     if exclude_booking_id:
         q1 = q1.where(Booking.id != exclude_booking_id)
 
-    res1 = await db.execute(q1)
-    for b in res1.scalars().all():
-        if times_overlap(start_time, end_time, b.start_time, b.end_time):
-            return False
-
-    # Check standalone coach bookings
-    q2 = select(CoachBooking).where(
+    # Standalone coach bookings
+    q2 = select(CoachBooking.id).where(
         and_(
             CoachBooking.coach_id == coach_id,
             CoachBooking.date == booking_date,
             CoachBooking.status == "confirmed",
+            CoachBooking.start_minute < end_minute,
+            CoachBooking.end_minute > start_minute,
         )
     )
     if exclude_coach_booking_id:
         q2 = q2.where(CoachBooking.id != exclude_coach_booking_id)
 
-    res2 = await db.execute(q2)
-    for cb in res2.scalars().all():
-        if times_overlap(start_time, end_time, cb.start_time, cb.end_time):
-            return False
+    result = await db.execute(select(or_(q1.exists(), q2.exists())))
+    return not result.scalar()
+
+
+async def fetch_court_intervals(
+    db: AsyncSession,
+    court_id: str,
+    booking_date: date
+) -> list[tuple[int, int]]:
+    """Return the confirmed (start, end) intervals booked on a court for one day, in one query."""
+    grouped = await fetch_court_intervals_range(db, court_id, booking_date, booking_date)
+    return grouped[booking_date]
+
+
+async def fetch_court_intervals_range(
+    db: AsyncSession,
+    court_id: str,
+    start_date: date,
+    end_date: date
+) -> dict:
+    """Return confirmed intervals on a court for every day in [start_date, end_date], grouped by date."""
+    result = await db.execute(
+        select(Booking.date, Booking.start_minute, Booking.end_minute).where(
+            and_(
+                Booking.court_id == court_id,
+                Booking.date.between(start_date, end_date),
+                Booking.status == "confirmed",
+            )
+        )
+    )
+    grouped = defaultdict(list)
+    for row in result.all():
+        grouped[row.date].append((row.start_minute, row.end_minute))
+    return grouped
+
+
+async def fetch_courts_intervals(
+    db: AsyncSession,
+    court_ids: list,
+    booking_date: date
+) -> dict:
+    """
+    Return confirmed intervals for several courts on one day, grouped by court id.
+    A single query over ix_bookings_court_date serves the whole set of courts.
+    """
+    grouped = {court_id: [] for court_id in court_ids}
+    if not court_ids:
+        return grouped
+    result = await db.execute(
+        select(Booking.court_id, Booking.start_minute, Booking.end_minute)
+        .where(
+            and_(
+                Booking.court_id.in_(court_ids),
+                Booking.date == booking_date,
+                Booking.status == "confirmed",
+            )
+        )
+        .order_by(Booking.court_id)
+    )
+    for row in result.all():
+        grouped[row.court_id].append((row.start_minute, row.end_minute))
+    return grouped
+
+
+async def fetch_coach_intervals(
+    db: AsyncSession,
+    coach_id: str,
+    booking_date: date
+) -> list[tuple[int, int]]:
+    """Return the confirmed (start, end) intervals booked on a coach for one day, in one query."""
+    grouped = await fetch_coach_intervals_range(db, coach_id, booking_date, booking_date)
+    return grouped[booking_date]
+
+
+async def fetch_coach_intervals_range(
+    db: AsyncSession,
+    coach_id: str,
+    start_date: date,
+    end_date: date
+) -> dict:
+    """
+    Return confirmed intervals on a coach for every day in [start_date, end_date], grouped by date.
+    Combo bookings and standalone coach bookings are read together with a single UNION ALL.
+    """
+    combo = select(Booking.date, Booking.start_minute, Booking.end_minute).where(
+        and_(
+            Booking.coach_id == coach_id,
+            Booking.date.between(start_date, end_date),
+            Booking.status == "confirmed",
+            Booking.include_coach == True,
+        )
+    )
+    standalone = select(CoachBooking.date, CoachBooking.start_minute, CoachBooking.end_minute).where(
+        and_(
+            CoachBooking.coach_id == coach_id,
+            CoachBooking.date.between(start_date, end_date),
+            CoachBooking.status == "confirmed",
+        )
+    )
+    result = await db.execute(union_all(combo, standalone))
+    grouped = defaultdict(list)
+    for row in result.all():
+        grouped[row.date].append((row.start_minute, row.end_minute))
+    return grouped
 
-    return True
+
+def mark_slots(time_slots: list[str], intervals: list[tuple[int, int]]) -> list[dict]:
+    """
+    Mark each consecutive slot in time_slots as free or taken with one sweep over the intervals.
+    Slots are visited in order, so every interval starting before the current slot ends has already
+    been seen; the slot is taken when the furthest end among those reaches past the slot start.
+    """
+    ordered = sorted(intervals)
+    slots = []
+    i, reach = 0, -1
+    for start, end in zip(time_slots, time_slots[1:]):
+        slot_start, slot_end = to_minutes(start), to_minutes(end)
+        while i < len(ordered) and ordered[i][0] < slot_end:
+            reach = max(reach, ordered[i][1])
+            i += 1
+        slots.append({"start_time": start, "end_time": end, "is_available": reach <= slot_start})
+    return slots
 
 
 async def get_court_available_slots(
@@ -95,12 +223,12 @@ async def get_court_available_slots(
     time_slots: list[str]
 ) -> list[dict]:
     """Return list of slots with availability status for a court."""
-    slots = []
-    for i in range(len(time_slots) - 1):
-        start = time_slots[i]
-        end = time_slots[i + 1]
-        available = await is_court_available(db, court_id, booking_date, start, end)
-        slots.append({"start_time": start, "end_time": end, "is_available": available})
+    slots = _cached_slots("court", court_id, booking_date, time_slots)
+    if slots is None:
+        generation = _generation("court", court_id)
+        intervals = await fetch_court_intervals(db, court_id, booking_date)
+        slots = mark_slots(time_slots, intervals)
+        _store_slots("court", court_id, booking_date, time_slots, slots, generation)
     return slots
 
 
@@ -111,10 +239,62 @@ async def get_coach_available_slots(
     time_slots: list[str]
 ) -> list[dict]:
     """Return list of slots with availability status for a coach."""
-    slots = []
-    for i in range(len(time_slots) - 1):
-        start = time_slots[i]
-        end = time_slots[i + 1]
-        available = await is_coach_available(db, coach_id, booking_date, start, end)
-        slots.append({"start_time": start, "end_time": end, "is_available": available})
+    slots = _cached_slots("coach", coach_id, booking_date, time_slots)
+    if slots is None:
+        generation = _generation("coach", coach_id)
+        intervals = await fetch_coach_intervals(db, coach_id, booking_date)
+        slots = mark_slots(time_slots, intervals)
+        _store_slots("coach", coach_id, booking_date, time_slots, slots, generation)
     return slots
+
+
+async def get_courts_available_slots(
+    db: AsyncSession,
+    court_ids: list,
+    booking_date: date,
+    time_slots: list[str]
+) -> dict:
+    """Return slots with availability status for each of several courts sharing one schedule."""
+    by_court = {court_id: _cached_slots("court", court_id, booking_date, time_slots) for court_id in court_ids}
+    missing = [court_id for court_id, slots in by_court.items() if slots is None]
+    if missing:
+        generations = {court_id: _generation("court", court_id) for court_id in missing}
+        grouped = await fetch_courts_intervals(db, missing, booking_date)
+        for court_id, intervals in grouped.items():
+            by_court[court_id] = mark_slots(time_slots, intervals)
+            _store_slots("court", court_id, booking_date, time_slots, by_court[court_id], generations[court_id])
+    return by_court
+
+
+async def _slots_range(db: AsyncSession, kind: str, resource_id: str, time_slots_by_date: dict, fetch_range) -> dict:
+    by_date = {day: _cached_slots(kind, resource_id, day, slots) for day, slots in time_slots_by_date.items()}
+    missing = [day for day, slots in by_date.items() if slots is None]
+    if missing:
+        generation = _generation(kind, resource_id)
+        # One query spanning the earliest to latest uncached day
+        grouped = await fetch_range(db, resource_id, min(missing), max(missing))
+        for day in missing:
+            by_date[day] = mark_slots(time_slots_by_date[day], grouped[day])
+            _store_slots(kind, resource_id, day, time_slots_by_date[day], by_date[day], generation)
+    return by_date
+
+
+async def get_court_available_slots_range(
+    db: AsyncSession,
+    court_id: str,
+    time_slots_by_date: dict
+) -> dict:
+    """
+    Return slots with availability status for a court on each requested day.
+    time_slots_by_date maps each open day to its slot boundaries; one query covers the whole span.
+    """
+    return await _slots_range(db, "court", court_id, time_slots_by_date, fetch_court_intervals_range)
+
+
+async def get_coach_available_slots_range(
+    db: AsyncSession,
+    coach_id: str,
+    time_slots_by_date: dict
+) -> dict:
+    """Return slots with availability status for a coach on each requested day, from one query."""
+    return await _slots_range(db, "coach", coach_id, time_slots_by_date, fetch_coach_intervals_range)
@@ -1 +1,30 @@
-# Booking creation + conflict detection — to be implemented
+# Booking creation + conflict detection
+from datetime import date
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Exclusion constraints (see migration 5d0f7a3e91c4) rejecting overlapping confirmed rows
+COURT_OVERLAP_CONSTRAINT = "ex_bookings_court_overlap"
+COMBO_COACH_OVERLAP_CONSTRAINT = "ex_bookings_coach_overlap"
+COACH_OVERLAP_CONSTRAINT = "ex_coach_bookings_coach_overlap"
+
+
+def overlap_violation(exc: IntegrityError) -> str | None:
+    """Return the name of the overlap constraint behind an IntegrityError, or None if it is something else."""
+    message = str(exc.orig)
+    for name in (COURT_OVERLAP_CONSTRAINT, COMBO_COACH_OVERLAP_CONSTRAINT, COACH_OVERLAP_CONSTRAINT):
+        if name in message:
+            return name
+    return None
+
+
+async def lock_coach_day(db: AsyncSession, coach_id: str, booking_date: date) -> None:
+    """
+    Take a transaction-scoped advisory lock on one coach-day.
+    A coach's bookings live in two tables, so no single constraint covers them; holding this lock
+    across the availability check and the insert serialises concurrent writers for that coach-day.
+    It is released automatically on commit or rollback.
+    """
+    key = func.hashtextextended(f"coach:{coach_id}:{booking_date}", 0)
+    await db.execute(select(func.pg_advisory_xact_lock(key)))
@@ -0,0 +1,42 @@
+import math
+from sqlalchemy import and_, func, or_
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lng, max_lng) enclosing every point within radius_km of (lat, lng).
+    Longitudes are not wrapped, so min_lng < -180 or max_lng > 180 means the box crosses the antimeridian.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle reaches a pole: every longitude is in range
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    dlng = math.degrees(math.asin(math.sin(math.radians(dlat)) / math.cos(math.radians(lat))))
+    return min_lat, max_lat, lng - dlng, lng + dlng
+
+
+def within_box(lat_col, lng_col, lat: float, lng: float, radius_km: float):
+    """Index-friendly range predicate for the bounding box around (lat, lng)."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    if min_lng < -180:
+        lng_clause = or_(lng_col >= min_lng + 360, lng_col <= max_lng)
+    elif max_lng > 180:
+        lng_clause = or_(lng_col >= min_lng, lng_col <= max_lng - 360)
+    else:
+        lng_clause = lng_col.between(min_lng, max_lng)
+    return and_(lat_col.between(min_lat, max_lat), lng_clause)
+
+
+def haversine_km(lat_col, lng_col, lat: float, lng: float):
+    """SQL expression for the great-circle distance in km from (lat, lng) to each row."""
+    dlat = func.radians(lat_col - lat)
+    dlng = func.radians(lng_col - lng)
+    a = func.power(func.sin(dlat / 2), 2) + (
+        math.cos(math.radians(lat)) * func.cos(func.radians(lat_col)) * func.power(func.sin(dlng / 2), 2)
+    )
+    # least() guards asin against a float result a hair above 1 for antipodal points
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))
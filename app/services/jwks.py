@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+
+logger = logging.getLogger("dinkr")
+
+
+class JWKSCache:
+    """
+    Process-wide cache of a JSON Web Key Set, with keys parsed once and indexed by `kid`.
+
+    - A stale set keeps being served while a background task refreshes it.
+    - An unknown `kid` (key rotation) triggers an immediate refetch, at most once per
+      `min_refetch_seconds` so garbage tokens cannot hammer the upstream.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        client: Callable[[], httpx.AsyncClient],
+        ttl_seconds: float = 3600.0,
+        min_refetch_seconds: float = 30.0,
+    ):
+        self.url = url
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self._keys: dict[str, Key] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    async def get_key(self, kid: str | None) -> Key | None:
+        if not self._keys:
+            await self.refresh()
+        elif time.monotonic() - self._fetched_at > self.ttl_seconds:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at > self.min_refetch_seconds:
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    async def refresh(self) -> None:
+        """Fetch and parse the key set. Concurrent callers share a single in-flight fetch."""
+        started = time.monotonic()
+        async with self._lock:
+            if self._fetched_at > started:
+                return  # another caller refreshed while we waited for the lock
+            res = await self._client().get(self.url)
+            res.raise_for_status()
+            keys = {}
+            for data in res.json().get("keys", []):
+                try:
+                    keys[data.get("kid")] = jwk.construct(data, data.get("alg", "RS256"))
+                except Exception:
+                    logger.warning("Skipping unparseable JWKS key kid=%s from %s", data.get("kid"), self.url)
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            logger.info("JWKS refreshed from %s: %d keys", self.url, len(keys))
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(self._safe_refresh())
+
+    async def _safe_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as exc:
+            # Keep serving the cached set; the next stale read retries
+            logger.warning("Background JWKS refresh failed: %s", exc)
@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import DateTime, literal, true, tuple_
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+
+def encode_cursor(values: dict) -> str:
+    """Pack the sort key of the last row on a page into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Unpack a cursor produced by encode_cursor. Raises ValueError if it was tampered with or truncated."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def created_cursor(row) -> str:
+    """Cursor for a catalogue row in (created_at, id) order."""
+    return encode_cursor({"c": row.created_at.isoformat(), "id": str(row.id)})
+
+
+def after_created(model, cursor: str | None):
+    """
+    Keyset predicate: rows of model strictly after the cursor in (created_at, id) order.
+    Raises ValueError for a cursor that does not decode to that key.
+    """
+    if not cursor:
+        return true()
+    values = decode_cursor(cursor)
+    try:
+        created_at, row_id = datetime.fromisoformat(values["c"]), UUID(values["id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    bound = tuple_(literal(created_at, DateTime(timezone=True)), literal(row_id, PG_UUID(as_uuid=True)))
+    return tuple_(model.created_at, model.id) > bound
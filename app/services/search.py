@@ -0,0 +1,29 @@
+from sqlalchemy import func, literal, literal_column
+from app.models.establishment import Establishment
+
+# Name matches count for more than location or description matches when ranking
+NAME_WEIGHT = 0.5
+
+
+def establishment_document():
+    """
+    Searchable text for an establishment. It must stay identical to the expression behind
+    ix_establishments_search_trgm, or Postgres cannot use the index. Literals are inlined, not bound,
+    for the same reason.
+    """
+    space = literal_column("' '")
+    return (
+        Establishment.name + space + Establishment.location + space
+        + func.coalesce(Establishment.description, literal_column("''"))
+    )
+
+
+def matches(query: str):
+    """pg_trgm word-similarity match (`<%`), answered from the GIN trigram index."""
+    return literal(query).op("<%")(establishment_document())
+
+
+def relevance(query: str):
+    """Best word similarity against the whole document, boosted when the name itself matches."""
+    q = literal(query)
+    return func.word_similarity(q, establishment_document()) + NAME_WEIGHT * func.word_similarity(q, Establishment.name)
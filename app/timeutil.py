@@ -0,0 +1,24 @@
+"""Conversions between the API's 'HH:MM' strings and minutes since midnight, used for storage."""
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(hhmm: str) -> int:
+    """Parse an 'HH:MM' string into minutes since midnight. 24:00 is accepted as end of day."""
+    try:
+        hours, minutes = hhmm.split(":")
+        total = int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError) as exc:
+        raise ValueError(f"Invalid time '{hhmm}', expected HH:MM") from exc
+    if len(hours) != 2 or len(minutes) != 2 or int(minutes) >= 60 or not 0 <= total <= MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time '{hhmm}', expected HH:MM")
+    return total
+
+
+def to_hhmm(minutes: int) -> str:
+    """Format minutes since midnight as an 'HH:MM' string."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def duration_hours(start_minute: int, end_minute: int) -> float:
+    return (end_minute - start_minute) / 60
@@ -0,0 +1,185 @@
+"""
+Run the benchmark scenarios and report latency percentiles and throughput per scenario.
+
+In-process (ASGI transport, no sockets — measures the app and the database only):
+    python -m bench.run --duration 20 --concurrency 16 --save baseline
+
+Against a running server (e.g. `uvicorn app.main:app --workers 4`):
+    python -m bench.run --url http://127.0.0.1:8000 --compare baseline
+
+Seed the database first with `python -m bench.seed`. Scenarios run one after another so each
+gets the whole concurrency budget; baselines live in bench/baselines/<name>.json.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import random
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+from bench.scenarios import SCENARIOS, Catalogue, ScenarioStats, Session
+from bench.seed import PASSWORD, USER_EMAIL
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(stats: ScenarioStats, elapsed: float) -> dict:
+    ordered = sorted(stats.latencies)
+    summary = {"requests": len(ordered), "errors": stats.errors, "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0}
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 2)
+    summary["statuses"] = {str(code): n for code, n in sorted(stats.statuses.items())}
+    return summary
+
+
+@asynccontextmanager
+async def open_client(url: str | None):
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=30.0) as client:
+            yield client
+        return
+    from app.main import app
+    # Per-request INFO logs would dominate the run and flood the terminal; warnings still come through
+    logging.getLogger("dinkr").setLevel(logging.WARNING)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30.0) as client:
+            yield client
+
+
+async def discover(client: httpx.AsyncClient) -> Catalogue:
+    establishment_ids, params = [], {"limit": 100}
+    while True:
+        response = await client.get("/establishments/", params=params)
+        response.raise_for_status()
+        establishment_ids += [e["id"] for e in response.json()]
+        if "x-next-cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["x-next-cursor"]
+    court_ids = []
+    for est_id in establishment_ids:
+        detail = await client.get(f"/establishments/{est_id}")
+        detail.raise_for_status()
+        court_ids += [c["id"] for c in detail.json()["courts"] if c.get("is_active", True)]
+    coaches = await client.get("/coaches/")
+    coaches.raise_for_status()
+    if not court_ids:
+        raise SystemExit("No courts found — seed the database first (python -m bench.seed)")
+    return Catalogue(establishment_ids, court_ids, [c["id"] for c in coaches.json()])
+
+
+async def login(client: httpx.AsyncClient, users: int) -> list[str]:
+    tokens = []
+    for i in range(users):
+        response = await client.post("/auth/login", json={"email": USER_EMAIL.format(i), "password": PASSWORD})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+async def run_scenario(client, name: str, tokens: list[str], catalogue: Catalogue, concurrency: int, duration: float, seed: int) -> ScenarioStats:
+    scenario = SCENARIOS[name]
+    stats = ScenarioStats()
+    deadline = time.perf_counter() + duration
+
+    async def worker(n: int):
+        session = Session(client, tokens[n % len(tokens)], catalogue, stats, random.Random(seed + n))
+        while time.perf_counter() < deadline:
+            await scenario(session)
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return stats
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: dict, baseline: dict | None) -> None:
+    header = f"{'scenario':<20}{'reqs':>8}{'err':>6}{'rps':>9}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<20}{r['requests']:>8}{r['errors']:>6}{r['rps']:>9}" + "".join(f"{r[f'p{p}_ms']:>10}" for p in PERCENTILES))
+        previous = (baseline or {}).get("results", {}).get(name)
+        if previous:
+            deltas = [_delta(r["rps"], previous["rps"])] + [_delta(r[f"p{p}_ms"], previous[f"p{p}_ms"]) for p in PERCENTILES]
+            print(f"{'  vs baseline':<34}{deltas[0]:>9}" + "".join(f"{d:>10}" for d in deltas[1:]))
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+async def main(args) -> None:
+    baseline = None
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+
+    async with open_client(args.url) as client:
+        catalogue = await discover(client)
+        tokens = await login(client, args.users)
+        print(
+            f"Target: {args.url or 'in-process'} · {len(catalogue.establishment_ids)} venues, "
+            f"{len(catalogue.court_ids)} courts, {len(catalogue.coach_ids)} coaches · "
+            f"concurrency {args.concurrency} · {args.duration:g}s per scenario\n"
+        )
+        results = {}
+        for name in args.scenario or SCENARIOS:
+            if args.warmup:
+                await run_scenario(client, name, tokens, catalogue, args.concurrency, args.warmup, args.random_seed)
+            started = time.perf_counter()
+            stats = await run_scenario(client, name, tokens, catalogue, args.concurrency, args.duration, args.random_seed)
+            results[name] = summarize(stats, time.perf_counter() - started)
+
+    print_report(results, baseline)
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps({
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"\nSaved baseline to {path}")
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server; omit to run the app in-process")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; default is all")
+    parser.add_argument("--concurrency", type=int, default=16, help="simulated users per scenario")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--users", type=int, default=20, help="seeded accounts to log in as")
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--save", metavar="NAME", help="write results to bench/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="print deltas against bench/baselines/NAME.json")
+    asyncio.run(main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,101 @@
+"""
+Scripted user flows for the benchmark runner.
+
+Each scenario is one iteration of a user journey; every HTTP call it makes is timed and attributed
+to the scenario. Statuses outside a call's expected set count as errors.
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import httpx
+
+OPEN_HOURS = range(6, 22)
+BOOKING_HORIZON_DAYS = 30
+
+
+@dataclass
+class Catalogue:
+    """IDs discovered through the public API before the run starts."""
+    establishment_ids: list[str]
+    court_ids: list[str]
+    coach_ids: list[str]
+
+
+@dataclass
+class ScenarioStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+
+class Session:
+    """One simulated user: an authenticated client plus the stats bucket of the running scenario."""
+
+    def __init__(self, client: httpx.AsyncClient, token: str, catalogue: Catalogue, stats: ScenarioStats, rng: random.Random):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.catalogue = catalogue
+        self.stats = stats
+        self.rng = rng
+
+    async def call(self, method: str, url: str, expect: tuple[int, ...] = (200,), **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        self.stats.latencies.append(time.perf_counter() - start)
+        self.stats.statuses[response.status_code] = self.stats.statuses.get(response.status_code, 0) + 1
+        if response.status_code not in expect:
+            self.stats.errors += 1
+        return response
+
+    def future_day(self) -> str:
+        return (date.today() + timedelta(days=self.rng.randint(1, BOOKING_HORIZON_DAYS))).isoformat()
+
+    async def book_court(self) -> httpx.Response:
+        hour = self.rng.choice(OPEN_HOURS)
+        payload = {
+            "court_id": self.rng.choice(self.catalogue.court_ids),
+            "date": self.future_day(),
+            "start_time": f"{hour:02d}:00",
+            "end_time": f"{hour + 1:02d}:00",
+        }
+        # 409 is a legitimate answer under contention, not a failure
+        return await self.call("POST", "/bookings/", expect=(201, 409), json=payload)
+
+
+async def browse_venues(s: Session) -> None:
+    await s.call("GET", "/establishments/", params={"limit": 20})
+    await s.call("GET", f"/establishments/{s.rng.choice(s.catalogue.establishment_ids)}")
+    await s.call("GET", "/coaches/")
+
+
+async def check_availability(s: Session) -> None:
+    day = s.future_day()
+    await s.call("GET", f"/availability/establishment/{s.rng.choice(s.catalogue.establishment_ids)}", params={"date": day})
+    await s.call("GET", f"/availability/court/{s.rng.choice(s.catalogue.court_ids)}", params={"date": day})
+    if s.catalogue.coach_ids:
+        await s.call("GET", f"/availability/coach/{s.rng.choice(s.catalogue.coach_ids)}", params={"date": day})
+
+
+async def book(s: Session) -> None:
+    await s.book_court()
+
+
+async def list_my_bookings(s: Session) -> None:
+    await s.call("GET", "/bookings/my")
+    await s.call("GET", "/schedule/my")
+
+
+async def cancel(s: Session) -> None:
+    response = await s.book_court()
+    if response.status_code == 201:
+        await s.call("DELETE", f"/bookings/{response.json()['id']}", expect=(204,))
+
+
+SCENARIOS = {
+    "browse_venues": browse_venues,
+    "check_availability": check_availability,
+    "book": book,
+    "list_my_bookings": list_my_bookings,
+    "cancel": cancel,
+}
@@ -0,0 +1,110 @@
+"""
+Seed a local database with a benchmark-sized catalogue and booking history.
+
+    python -m bench.seed --establishments 20 --courts 6 --coaches 15 --users 200 --bookings 5000
+
+Point DATABASE_URL at a disposable, migrated Postgres database. Seeding is skipped if the bench
+owner account already exists.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+from datetime import date, timedelta
+from sqlalchemy import insert, select
+from app.database import AsyncSessionLocal
+from app.models import User, Establishment, Court, Coach, Booking, CoachBooking
+from app.services.passwords import pwd_context
+
+OWNER_EMAIL = "bench-owner@dinkr.test"
+USER_EMAIL = "bench-user-{}@dinkr.test"
+PASSWORD = "bench-password"
+OPEN_HOURS = range(6, 22)
+
+
+async def seed(establishments: int, courts: int, coaches: int, users: int, bookings: int, days: int, rng: random.Random) -> None:
+    async with AsyncSessionLocal() as db:
+        if (await db.execute(select(User.id).where(User.email == OWNER_EMAIL))).scalar_one_or_none():
+            print("Bench data already present — skipping seed")
+            return
+
+        hashed = pwd_context.hash(PASSWORD)  # one bcrypt hash shared by every bench account
+        owner = User(email=OWNER_EMAIL, hashed_password=hashed, full_name="Bench Owner")
+        players = [User(email=USER_EMAIL.format(i), hashed_password=hashed, full_name=f"Bench User {i}") for i in range(users)]
+        db.add_all([owner, *players])
+        await db.flush()
+
+        ests = [
+            Establishment(owner_id=owner.id, name=f"Bench Venue {i}", location=f"Bench City {i % 5}", latitude=14.5 + i / 100, longitude=121.0 + i / 100)
+            for i in range(establishments)
+        ]
+        db.add_all(ests)
+        await db.flush()
+        court_rows = [Court(establishment_id=e.id, name=f"Court {n + 1}", price_per_hour=400 + 50 * n) for e in ests for n in range(courts)]
+        coach_rows = [Coach(user_id=owner.id, name=f"Bench Coach {i}", rate_per_hour=700) for i in range(coaches)]
+        db.add_all(court_rows + coach_rows)
+        await db.flush()
+
+        # Distinct (resource, day, hour) picks keep the rows valid under the overlap constraints
+        start = date.today() - timedelta(days=days // 2)
+        court_slots = rng.sample(list(itertools.product(range(len(court_rows)), range(days), OPEN_HOURS)), bookings)
+        busy_coach = set()
+        booking_rows = []
+        for court_idx, day, hour in court_slots:
+            coach_idx = rng.randrange(coaches) if rng.random() < 0.1 else None
+            if coach_idx is not None and (coach_idx, day, hour) in busy_coach:
+                coach_idx = None
+            if coach_idx is not None:
+                busy_coach.add((coach_idx, day, hour))
+            booking_rows.append({
+                "court_id": court_rows[court_idx].id,
+                "user_id": rng.choice(players).id,
+                "coach_id": coach_rows[coach_idx].id if coach_idx is not None else None,
+                "include_coach": coach_idx is not None,
+                "date": start + timedelta(days=day),
+                "start_minute": hour * 60,
+                "end_minute": hour * 60 + 60,
+                "total_price": 500.0,
+                "status": "confirmed",
+            })
+        coach_booking_rows = []
+        for coach_idx, day, hour in rng.sample(list(itertools.product(range(coaches), range(days), OPEN_HOURS)), bookings // 5):
+            if (coach_idx, day, hour) in busy_coach:
+                continue
+            coach_booking_rows.append({
+                "coach_id": coach_rows[coach_idx].id,
+                "user_id": rng.choice(players).id,
+                "date": start + timedelta(days=day),
+                "start_minute": hour * 60,
+                "end_minute": hour * 60 + 60,
+                "total_price": 700.0,
+                "status": "confirmed",
+            })
+        await db.execute(insert(Booking), booking_rows)
+        if coach_booking_rows:
+            await db.execute(insert(CoachBooking), coach_booking_rows)
+        await db.commit()
+        print(
+            f"Seeded {len(ests)} venues, {len(court_rows)} courts, {len(coach_rows)} coaches, {len(players)} users, "
+            f"{len(booking_rows)} court bookings, {len(coach_booking_rows)} coach bookings"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--establishments", type=int, default=20)
+    parser.add_argument("--courts", type=int, default=6, help="courts per establishment")
+    parser.add_argument("--coaches", type=int, default=15)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=60, help="booking history spread, centred on today")
+    parser.add_argument("--random-seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(seed(
+        args.establishments, args.courts, args.coaches, args.users, args.bookings, args.days,
+        random.Random(args.random_seed),
+    ))
+
+
+if __name__ == "__main__":
+    main()
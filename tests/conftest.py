@@ -0,0 +1,38 @@
+import os
+import httpx
+import pytest
+import pytest_asyncio
+
+# The app reads its settings at import time; point it at the disposable test database first.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL not set (needs a disposable Postgres database)")
+    for item in items:
+        item.add_marker(skip)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def schema():
+    """Fresh tables for the whole session."""
+    from app.database import engine, Base
+
+    async with engine.begin() as conn:
+        # Extensions the migrations install and create_all does not
+        await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    from app.main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
@@ -0,0 +1,63 @@
+"""
+SQL query-count harness for route budgets.
+
+QueryCounter hooks SQLAlchemy's before_cursor_execute on the app engine and records every statement
+sent while it is active, so a test can assert that a route stays within its declared budget.
+"""
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    def __init__(self, engine: AsyncEngine):
+        self._engine = engine.sync_engine
+        self.statements: list[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self._engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Maximum statements a route may issue on the seeded dataset, with cold caches."""
+    route: str
+    max_queries: int
+    params: dict = field(default_factory=dict)
+    auth: bool = False
+
+
+# Every GET route must be listed here. Placeholders in `route` are filled from the seeded ids.
+QUERY_BUDGETS = [
+    Budget("/health", 0),
+    Budget("/metrics", 0),
+    Budget("/auth/me", 1, auth=True),
+    Budget("/establishments/", 1),
+    Budget("/establishments/nearby", 1, {"lat": "14.5547", "lng": "121.0244", "radius_km": "5"}),
+    Budget("/establishments/search", 1, {"q": "makati"}),
+    Budget("/establishments/{establishment_id}", 2),
+    Budget("/establishments/{establishment_id}/courts", 1),
+    Budget("/courts/{court_id}", 1),
+    Budget("/coaches/", 1),
+    Budget("/coaches/{coach_id}", 1),
+    Budget("/bookings/my", 2, auth=True),
+    Budget("/coach-bookings/my", 2, auth=True),
+    Budget("/schedule/my", 2, auth=True),
+    Budget("/schedule/my", 2, {"when": "past"}, auth=True),
+    Budget("/availability/court/{court_id}", 3, {"date": "{day}"}),
+    Budget("/availability/court/{court_id}", 3, {"start_date": "{day}", "end_date": "{month_end}"}),
+    Budget("/availability/coach/{coach_id}", 2, {"date": "{day}"}),
+    Budget("/availability/coach/{coach_id}", 2, {"start_date": "{day}", "end_date": "{month_end}"}),
+    Budget("/availability/establishment/{establishment_id}", 3, {"date": "{day}"}),
+]
@@ -0,0 +1,34 @@
+from datetime import date
+from uuid import uuid4
+
+
+async def test_invalidation_during_fetch_is_not_overwritten(monkeypatch):
+    """A read that started before a booking's invalidation must not cache its pre-booking snapshot."""
+    from app.services import availability
+
+    court_id, day, time_slots = str(uuid4()), date(2030, 1, 7), ["08:00", "09:00", "10:00"]
+
+    async def fetch_while_booking_commits(db, court_id, booking_date):
+        availability.invalidate_availability("court", court_id, booking_date)
+        return []  # the snapshot taken before the booking
+
+    monkeypatch.setattr(availability, "fetch_court_intervals", fetch_while_booking_commits)
+    slots = await availability.get_court_available_slots(None, court_id, day, time_slots)
+
+    assert all(slot["is_available"] for slot in slots)
+    assert availability._cached_slots("court", court_id, day, time_slots) is None
+
+
+async def test_fetch_without_invalidation_is_cached(monkeypatch):
+    from app.services import availability
+
+    court_id, day, time_slots = str(uuid4()), date(2030, 1, 7), ["08:00", "09:00", "10:00"]
+
+    async def fetch(db, court_id, booking_date):
+        return [(480, 540)]
+
+    monkeypatch.setattr(availability, "fetch_court_intervals", fetch)
+    await availability.get_court_available_slots(None, court_id, day, time_slots)
+
+    cached = availability._cached_slots("court", court_id, day, time_slots)
+    assert [slot["is_available"] for slot in cached] == [False, True]
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from datetime import date, timedelta
+from types import SimpleNamespace
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture
+async def venue(schema):
+    """A fresh court and coach, plus two players."""
+    from app.database import AsyncSessionLocal
+    from app.models import User, Establishment, Court, Coach
+    from app.routers.auth import create_access_token
+
+    tag = os.urandom(4).hex()
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"owner-{tag}@example.com", full_name="Owner")
+        players = [User(email=f"player{i}-{tag}@example.com", full_name=f"Player {i}") for i in range(2)]
+        db.add_all([owner, *players])
+        await db.flush()
+        est = Establishment(owner_id=owner.id, name=f"Venue {tag}", location="Pasig")
+        db.add(est)
+        await db.flush()
+        court = Court(establishment_id=est.id, name="Court 1", price_per_hour=500)
+        coach = Coach(user_id=owner.id, name=f"Coach {tag}", rate_per_hour=800)
+        db.add_all([court, coach])
+        await db.commit()
+
+    return SimpleNamespace(
+        court_id=str(court.id),
+        coach_id=str(coach.id),
+        day=(date.today() + timedelta(days=3)).isoformat(),
+        players=[{"Authorization": f"Bearer {create_access_token(p.id)}"} for p in players],
+    )
+
+
+async def test_overlapping_court_booking_is_rejected(client, venue):
+    first = await client.post("/bookings/", headers=venue.players[0], json={
+        "court_id": venue.court_id, "date": venue.day, "start_time": "10:00", "end_time": "11:00",
+    })
+    overlap = await client.post("/bookings/", headers=venue.players[1], json={
+        "court_id": venue.court_id, "date": venue.day, "start_time": "10:30", "end_time": "11:30",
+    })
+    adjacent = await client.post("/bookings/", headers=venue.players[1], json={
+        "court_id": venue.court_id, "date": venue.day, "start_time": "11:00", "end_time": "12:00",
+    })
+
+    assert first.status_code == 201, first.text
+    assert overlap.status_code == 409
+    assert overlap.json()["detail"] == "Court is not available for the selected time slot"
+    assert adjacent.status_code == 201, adjacent.text
+
+
+async def test_concurrent_court_bookings_admit_exactly_one(client, venue):
+    payload = {"court_id": venue.court_id, "date": venue.day, "start_time": "15:00", "end_time": "16:00"}
+
+    results = await asyncio.gather(*(
+        client.post("/bookings/", headers=headers, json=payload) for headers in venue.players
+    ))
+
+    assert sorted(r.status_code for r in results) == [201, 409]
+
+
+async def test_coach_in_a_combo_booking_cannot_be_booked_standalone(client, venue):
+    combo = await client.post("/bookings/", headers=venue.players[0], json={
+        "court_id": venue.court_id, "date": venue.day, "start_time": "14:00", "end_time": "15:00",
+        "include_coach": True, "coach_id": venue.coach_id,
+    })
+    standalone = await client.post("/coach-bookings/", headers=venue.players[1], json={
+        "coach_id": venue.coach_id, "date": venue.day, "start_time": "14:30", "end_time": "15:30",
+    })
+
+    assert combo.status_code == 201, combo.text
+    assert standalone.status_code == 409
+    assert standalone.json()["detail"] == "Coach is not available for the selected time slot"
@@ -0,0 +1,43 @@
+import json
+import logging
+import queue
+
+
+def test_json_records_carry_a_structured_traceback():
+    from app.logging_setup import JsonFormatter, StructuredQueueHandler
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("dinkr.test.json")
+    logger.propagate = False
+    logger.addHandler(StructuredQueueHandler(log_queue))
+    try:
+        raise ValueError("x")
+    except ValueError:
+        logger.exception("boom %s", 42, extra={"route": "/courts/{court_id}"})
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+
+    assert entry["msg"] == "boom 42"
+    assert entry["route"] == "/courts/{court_id}"
+    assert entry["exc"].startswith("Traceback")
+    assert entry["exc"].rstrip().endswith("ValueError: x")
+
+
+def test_text_records_keep_the_traceback_after_the_message():
+    from app.logging_setup import StructuredQueueHandler, TextFormatter
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("dinkr.test.text")
+    logger.propagate = False
+    logger.addHandler(StructuredQueueHandler(log_queue))
+    try:
+        raise ValueError("x")
+    except ValueError:
+        logger.exception("boom")
+
+    record = log_queue.get_nowait()
+    record.request_id = None
+    lines = TextFormatter().format(record).splitlines()
+
+    assert lines[0].endswith("boom")
+    assert lines[-1] == "ValueError: x"
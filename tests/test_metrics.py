@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+
+async def test_failed_statements_are_counted_per_request(schema):
+    from app import metrics
+    from app.database import engine
+
+    stats = metrics.QueryStats()
+    token = metrics.query_stats_var.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+            with pytest.raises(DBAPIError):
+                await conn.exec_driver_sql("SELECT 1 / 0")
+            await conn.rollback()
+            await conn.exec_driver_sql("SELECT 1")
+    finally:
+        metrics.query_stats_var.reset(token)
+
+    assert stats.queries == 3
+    assert stats.seconds > 0
+
+
+async def test_unhandled_errors_are_counted_as_500():
+    from uuid import uuid4
+    import httpx
+    from app import metrics
+    from app.database import get_db
+    from app.main import app
+
+    async def broken_db():
+        raise RuntimeError("database unreachable")
+        yield
+
+    app.dependency_overrides[get_db] = broken_db
+    try:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            res = await client.get(f"/courts/{uuid4()}")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert res.status_code == 500
+    assert 'http_requests_total{method="GET",route="/courts/{court_id}",status="500"}' in metrics.render()
@@ -0,0 +1,58 @@
+import os
+import pytest_asyncio
+from sqlalchemy import select
+
+
+@pytest_asyncio.fixture
+async def account(schema):
+    from app.database import AsyncSessionLocal
+    from app.models import User
+    from app.routers.auth import create_access_token
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"principal-{os.urandom(4).hex()}@example.com", full_name="Principal")
+        db.add(user)
+        await db.commit()
+    return user.id, {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+async def _set_active(user_id, active: bool, commit: bool = True):
+    from app.database import AsyncSessionLocal
+    from app.models import User
+
+    db = AsyncSessionLocal()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one()
+    user.is_active = active
+    await db.flush()
+    if commit:
+        await db.commit()
+        await db.close()
+    return db
+
+
+async def test_deactivation_takes_effect_on_the_next_request(client, account):
+    user_id, headers = account
+    assert (await client.get("/auth/me", headers=headers)).status_code == 200  # now cached
+
+    await _set_active(user_id, False)
+
+    res = await client.get("/auth/me", headers=headers)
+    assert res.status_code == 403
+    assert res.json()["detail"] == "Account is deactivated"
+
+
+async def test_uncommitted_deactivation_is_not_cached_past_commit(client, account):
+    from app.dependencies import principal_cache
+
+    user_id, headers = account
+    pending = await _set_active(user_id, False, commit=False)
+    try:
+        # Flushed but not committed: another request still sees (and may cache) the active row
+        assert (await client.get("/auth/me", headers=headers)).status_code == 200
+        assert principal_cache.get(str(user_id)) is not None
+        await pending.commit()
+    finally:
+        await pending.close()
+
+    assert principal_cache.get(str(user_id)) is None
+    assert (await client.get("/auth/me", headers=headers)).status_code == 403
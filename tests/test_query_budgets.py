@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+import pytest
+import pytest_asyncio
+from fastapi.routing import APIRoute
+from tests.query_budget import QueryCounter, QUERY_BUDGETS
+
+
+@pytest_asyncio.fixture(scope="session")
+async def seeded(schema):
+    """A venue with 12 courts, 3 coaches and a player with a long booking history."""
+    from app.database import AsyncSessionLocal
+    from app.models import User, Establishment, Court, Coach, Booking, CoachBooking
+    from app.routers.auth import create_access_token
+
+    day = date.today() + timedelta(days=1)
+    async with AsyncSessionLocal() as db:
+        owner = User(email="owner@example.com", full_name="Owner")
+        player = User(email="player@example.com", full_name="Player")
+        db.add_all([owner, player])
+        await db.flush()
+        est = Establishment(
+            owner_id=owner.id, name="Dink Club", location="Makati", description="Indoor courts",
+            latitude=14.5547, longitude=121.0244,
+        )
+        db.add(est)
+        await db.flush()
+        courts = [Court(establishment_id=est.id, name=f"Court {i}", price_per_hour=500) for i in range(12)]
+        coaches = [Coach(user_id=owner.id, name=f"Coach {i}", rate_per_hour=800) for i in range(3)]
+        db.add_all(courts + coaches)
+        await db.flush()
+
+        # Enough rows that any per-row query would blow every budget below
+        for i in range(240):
+            start = 6 * 60 + (i % 16) * 60
+            coach = coaches[i % 3] if i % 5 == 0 else None
+            db.add(Booking(
+                court_id=courts[i % 12].id, user_id=player.id, coach_id=coach.id if coach else None,
+                date=day + timedelta(days=i // 16 - 7), start_minute=start, end_minute=start + 60,
+                total_price=500, include_coach=coach is not None,
+            ))
+        for i in range(60):
+            start = 7 * 60 + (i % 12) * 60
+            db.add(CoachBooking(
+                coach_id=coaches[i % 3].id, user_id=player.id,
+                date=day + timedelta(days=i // 12 - 2), start_minute=start, end_minute=start + 60, total_price=800,
+            ))
+        await db.commit()
+
+    return SimpleNamespace(
+        token=create_access_token(player.id),
+        ids={
+            "establishment_id": est.id,
+            "court_id": courts[0].id,
+            "coach_id": coaches[0].id,
+            "day": day.isoformat(),
+            "month_end": (day + timedelta(days=30)).isoformat(),
+        },
+    )
+
+
+def _budget_id(budget) -> str:
+    return budget.route + ("?" + "&".join(budget.params) if budget.params else "")
+
+
+@pytest.mark.parametrize("budget", QUERY_BUDGETS, ids=_budget_id)
+async def test_route_stays_within_query_budget(client, seeded, budget):
+    from app.database import engine
+    from app.services.cache import clear_caches
+
+    path = budget.route.format(**seeded.ids)
+    params = {k: v.format(**seeded.ids) for k, v in budget.params.items()}
+    headers = {"Authorization": f"Bearer {seeded.token}"} if budget.auth else {}
+
+    clear_caches()  # measure the cold path
+    with QueryCounter(engine) as counter:
+        res = await client.get(path, params=params, headers=headers)
+
+    assert res.status_code == 200, res.text
+    assert counter.count <= budget.max_queries, (
+        f"{_budget_id(budget)} issued {counter.count} queries (budget {budget.max_queries}):\n"
+        + "\n".join(counter.statements)
+    )
+
+
+def test_every_get_route_declares_a_budget():
+    from app.main import app
+
+    declared = {b.route for b in QUERY_BUDGETS}
+    get_routes = {r.path for r in app.routes if isinstance(r, APIRoute) and "GET" in r.methods}
+    assert get_routes <= declared, f"GET routes without a query budget: {sorted(get_routes - declared)}"
@@ -0,0 +1,177 @@
+import os
+from types import SimpleNamespace
+import pytest
+import pytest_asyncio
+
+BOUNDARY = "dinkr-test-boundary"
+
+
+def multipart(data: bytes, content_type: str = "image/png", filename: str = "photo.png") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+HEADERS = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+
+
+def png(size: int) -> bytes:
+    # Only the declared part type and the size are checked; random bytes keep every test's upload distinct
+    return b"\x89PNG\r\n\x1a\n" + os.urandom(size - 8)
+
+
+class FakeUploader:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, fileobj, folder: str) -> str:
+        self.calls.append((folder, len(fileobj.read())))
+        return f"https://cdn.test/dinkr/{folder}/{len(self.calls)}.png"
+
+
+@pytest_asyncio.fixture
+async def uploader(schema):
+    from app.main import app
+    from app.routers.upload import get_uploader
+
+    fake = FakeUploader()
+    app.dependency_overrides[get_uploader] = lambda: fake
+    yield fake
+    app.dependency_overrides.pop(get_uploader, None)
+
+
+async def test_photo_upload_is_pushed_upstream(client, uploader):
+    res = await client.post("/upload/photo", content=multipart(png(200 * 1024)), headers=HEADERS)
+
+    assert res.status_code == 200, res.text
+    assert res.json() == {"url": "https://cdn.test/dinkr/photos/1.png"}
+    assert uploader.calls == [("photos", 200 * 1024)]
+
+
+async def test_chunked_oversize_body_is_rejected_while_streaming(client, uploader):
+    from app.routers.upload import PHOTO_MAX_BYTES
+
+    body = multipart(png(PHOTO_MAX_BYTES + 512 * 1024))
+
+    async def chunks():
+        # No Content-Length: the limit has to be enforced on the stream itself
+        for i in range(0, len(body), 64 * 1024):
+            yield body[i:i + 64 * 1024]
+
+    res = await client.post("/upload/photo", content=chunks(), headers=HEADERS)
+
+    assert res.status_code == 413, res.text
+    assert uploader.calls == []
+
+
+async def test_non_image_content_type_is_rejected(client, uploader):
+    res = await client.post(
+        "/upload/photo", content=multipart(os.urandom(200 * 1024), "application/pdf", "doc.pdf"), headers=HEADERS
+    )
+
+    assert res.status_code == 400
+    assert "JPEG, PNG, WebP, and GIF" in res.json()["detail"]
+    assert uploader.calls == []
+
+
+@pytest.mark.parametrize("body", [b"garbage", b"--" + BOUNDARY.encode() + b"\r\nno-colon-header\r\n\r\n"])
+async def test_malformed_multipart_body_is_a_bad_request(client, uploader, body):
+    res = await client.post("/upload/photo", content=body, headers=HEADERS)
+
+    assert res.status_code == 400, res.text
+    assert uploader.calls == []
+
+
+async def test_repeat_upload_of_same_bytes_is_deduplicated(client, uploader):
+    body = multipart(png(150 * 1024))
+
+    first = await client.post("/upload/photo", content=body, headers=HEADERS)
+    second = await client.post("/upload/photo", content=body, headers=HEADERS)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["url"] == second.json()["url"]
+    assert len(uploader.calls) == 1
+
+
+async def test_same_bytes_in_another_folder_are_uploaded_again(client, uploader):
+    data = png(150 * 1024)
+
+    photo = await client.post("/upload/photo", content=multipart(data), headers=HEADERS)
+    avatar = await client.post("/upload/avatar", content=multipart(data), headers=HEADERS)
+
+    assert photo.status_code == avatar.status_code == 200
+    assert [folder for folder, _ in uploader.calls] == ["photos", "avatars"]
+
+
+@pytest_asyncio.fixture
+async def auth_headers(schema):
+    from app.database import AsyncSessionLocal
+    from app.models import User
+    from app.routers.auth import create_access_token
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"uploader-{os.urandom(4).hex()}@example.com", full_name="Uploader")
+        db.add(user)
+        await db.commit()
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Signs like the real provider and serves asset metadata from a dict instead of its admin API."""
+    import cloudinary
+    import cloudinary.utils
+    from app.routers import upload
+
+    monkeypatch.setattr(cloudinary.config(), "api_secret", "test-secret")
+    assets, deleted = {}, []
+
+    def put(public_id: str, version: int, size: int, fmt: str = "png") -> str:
+        assets[public_id] = {
+            "version": version, "bytes": size, "format": fmt,
+            "secure_url": f"https://cdn.test/v{version}/{public_id}.{fmt}",
+        }
+        return cloudinary.utils.api_sign_request(
+            {"public_id": public_id, "version": version}, "test-secret", signature_version=1
+        )
+
+    monkeypatch.setattr(upload, "_cloudinary_resource", lambda public_id: assets[public_id])
+    monkeypatch.setattr(upload, "_cloudinary_destroy", deleted.append)
+    return SimpleNamespace(put=put, deleted=deleted)
+
+
+async def test_direct_upload_routes_require_auth(client):
+    assert (await client.post("/upload/sign", json={"kind": "photo"})).status_code == 401
+    assert (await client.post("/upload/confirm", json={
+        "kind": "photo", "public_id": "dinkr/photos/a", "version": 1, "signature": "x",
+    })).status_code == 401
+
+
+async def test_confirm_reads_size_from_storage(client, auth_headers, storage):
+    signature = storage.put("dinkr/photos/court", 7, 300 * 1024)
+
+    res = await client.post("/upload/confirm", headers=auth_headers, json={
+        "kind": "photo", "public_id": "dinkr/photos/court", "version": 7, "signature": signature,
+        "bytes": 1,  # client claims are ignored
+    })
+
+    assert res.status_code == 200, res.text
+    assert res.json() == {"url": "https://cdn.test/v7/dinkr/photos/court.png"}
+    assert storage.deleted == []
+
+
+async def test_confirm_deletes_oversize_direct_upload(client, auth_headers, storage):
+    from app.routers.upload import PHOTO_MAX_BYTES
+
+    signature = storage.put("dinkr/photos/huge", 3, 10 * PHOTO_MAX_BYTES)
+
+    res = await client.post("/upload/confirm", headers=auth_headers, json={
+        "kind": "photo", "public_id": "dinkr/photos/huge", "version": 3, "signature": signature,
+        "bytes": 200 * 1024,
+    })
+
+    assert res.status_code == 400
+    assert "too large" in res.json()["detail"]
+    assert storage.deleted == ["dinkr/photos/huge"]